@@ -4,15 +4,28 @@ Uses pydantic-settings for type-safe environment variable loading
 """
 
 import os
+from functools import cached_property
 from dotenv import load_dotenv
-from typing import Literal
-from pydantic import Field, field_validator
+from typing import Any, Literal
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Load .env file globally so os.getenv() works everywhere
 load_dotenv()
 
 
+def _with_0x_prefix(private_key: str) -> str:
+    """
+    Add the 0x prefix to a hex private key if it's missing
+
+    Applied in model_post_init rather than a field validator, which keeps
+    validator dispatch out of settings construction.
+    """
+    if private_key and not private_key.startswith("0x"):
+        return f"0x{private_key}"
+    return private_key
+
+
 class MarketplaceConfig(BaseSettings):
     """Configuration for the Marketplace FastAPI server"""
 
@@ -52,8 +65,8 @@ class MarketplaceConfig(BaseSettings):
     )
 
     # CORS Configuration
-    cors_origins: list[str] = Field(
-        default=["http://localhost:3000"],
+    cors_origins: tuple[str, ...] = Field(
+        default=("http://localhost:3000",),
         description="Allowed CORS origins"
     )
 
@@ -98,6 +111,10 @@ class MarketplaceConfig(BaseSettings):
         default=100,
         description="Maximum file size in MB"
     )
+    storage_multipart_threshold_mb: int = Field(
+        default=100,
+        description="Files larger than this are streamed from disk in chunks"
+    )
 
     # Session Configuration
     default_session_duration_minutes: int = Field(
@@ -113,6 +130,11 @@ class MarketplaceConfig(BaseSettings):
         description="Session heartbeat interval in seconds"
     )
 
+    @cached_property
+    def cors_origins_set(self) -> frozenset[str]:
+        """CORS origins as a set for O(1) membership checks"""
+        return frozenset(self.cors_origins)
+
 
 class SellerConfig(BaseSettings):
     """Configuration for Seller Agent"""
@@ -140,6 +162,18 @@ class SellerConfig(BaseSettings):
     job_timeout: int = Field(default=3600, description="Max job duration in seconds (batch jobs)")
     notebook_timeout: int = Field(default=7200, description="Max notebook session duration in seconds (2 hours)")
     container_timeout: int = Field(default=10800, description="Max container session duration in seconds (3 hours)")
+    tmpfs_workspace: bool = Field(
+        default=False,
+        description="Keep job workspaces on /dev/shm (RAM) instead of the system temp dir"
+    )
+    requirements_cache_max_entries: int = Field(
+        default=20,
+        description="Installed requirement sets kept on disk per execution mode, least recently used evicted first (0 keeps all)"
+    )
+    use_uvloop: bool = Field(
+        default=True,
+        description="Run the agent on uvloop (faster subprocess spawn and pipe reads) when installed"
+    )
     
     # Docker Sandboxing Configuration
     docker_enabled: bool = Field(default=True, description="Enable Docker sandboxing for job execution")
@@ -147,8 +181,20 @@ class SellerConfig(BaseSettings):
     docker_image_gpu: str = Field(default="computeswarm-sandbox-gpu:latest", description="Docker image for GPU (CUDA) sandboxed execution")
     docker_memory_limit: str = Field(default="4g", description="Memory limit for Docker containers")
     docker_cpu_limit: float = Field(default=2.0, description="CPU limit for Docker containers")
+    docker_auto_limits: bool = Field(
+        default=False,
+        description="Size container CPU/memory limits from the host's cgroup budget, overriding the two limits above"
+    )
     docker_pids_limit: int = Field(default=100, description="Process limit for Docker containers")
     docker_tmpfs_size: str = Field(default="1g", description="Size of tmpfs mount in containers")
+    docker_warm_pool_size: int = Field(
+        default=0,
+        description="Idle sandbox containers kept per image/GPU combination for requirement-free jobs (0 disables)"
+    )
+    docker_cpu_pinning: bool = Field(
+        default=True,
+        description="Pin each job container to CPUs on one NUMA node (local Docker daemon only; warm pool containers stay unpinned)"
+    )
     
     # Model Cache Configuration (for persistent HuggingFace/PyTorch model caching)
     model_cache_dir: str = Field(
@@ -169,8 +215,8 @@ class SellerConfig(BaseSettings):
         default=300,
         description="Maximum time for network-enabled setup phase in seconds (5 minutes default)"
     )
-    docker_network_whitelist: list[str] = Field(
-        default=[
+    docker_network_whitelist: tuple[str, ...] = Field(
+        default=(
             "pypi.org",
             "files.pythonhosted.org",
             "huggingface.co",
@@ -179,7 +225,7 @@ class SellerConfig(BaseSettings):
             "cdn-lfs.huggingface.co",
             "download.pytorch.org",
             "s3.amazonaws.com"
-        ],
+        ),
         description="Whitelisted domains for network access during setup (DNS-based filtering not implemented, but documented)"
     )
 
@@ -207,8 +253,8 @@ class SellerConfig(BaseSettings):
         default=8988,
         description="Ending port for Jupyter sessions"
     )
-    allowed_docker_registries: list[str] = Field(
-        default=["docker.io", "ghcr.io", "computeswarm"],
+    allowed_docker_registries: tuple[str, ...] = Field(
+        default=("docker.io", "ghcr.io", "computeswarm"),
         description="Allowed Docker registries for custom containers"
     )
 
@@ -218,12 +264,8 @@ class SellerConfig(BaseSettings):
         description="Public hostname for session URLs"
     )
 
-    @field_validator("seller_private_key")
-    @classmethod
-    def validate_private_key(cls, v):
-        if v and not v.startswith("0x"):
-            return f"0x{v}"
-        return v
+    def model_post_init(self, __context: Any) -> None:
+        self.seller_private_key = _with_0x_prefix(self.seller_private_key)
 
 
 class BuyerConfig(BaseSettings):
@@ -252,12 +294,8 @@ class BuyerConfig(BaseSettings):
     rpc_url: str = Field(default="https://sepolia.base.org")
     usdc_contract_address: str = Field(default="0x036CbD53842c5426634e7929541eC2318f3dCF7e")
 
-    @field_validator("buyer_private_key")
-    @classmethod
-    def validate_private_key(cls, v):
-        if v and not v.startswith("0x"):
-            return f"0x{v}"
-        return v
+    def model_post_init(self, __context: Any) -> None:
+        self.buyer_private_key = _with_0x_prefix(self.buyer_private_key)
 
 
 # Singleton instances
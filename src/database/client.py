@@ -6,22 +6,176 @@ Provides type-safe database operations for queue-based job management
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from decimal import Decimal
+import asyncio
 import os
+import threading
+import time
 
-from supabase import create_client, Client
+import httpx
+import structlog
+from supabase import AsyncClient
+from postgrest import ReturnMethod
 from pydantic import BaseModel
 
 from src.models import ComputeNode, ComputeJob, JobStatus, GPUType, SellerProfile, VerificationStatus
 
+logger = structlog.get_logger()
+
+# Database enum spelling of each GPU type (the gpu_type enums are uppercase: CUDA, MPS, CPU)
+GPU_TYPE_DB: Dict[GPUType, str] = {gt: gt.value.upper() for gt in GPUType}
+
+# PostgREST or-filters for get_pending_jobs, built once per GPU type instead of per poll
+_PENDING_GPU_FILTERS: Dict[GPUType, str] = {
+    gt: f"required_gpu_type.is.null,required_gpu_type.eq.{db_value}" for gt, db_value in GPU_TYPE_DB.items()
+}
+
+# How long heartbeats are buffered before being flushed in one heartbeat_many RPC
+HEARTBEAT_FLUSH_INTERVAL = 0.5
+
+# Projections for the hot listing queries: only the columns their consumers read.
+# Pending-job listings leave out script/requirements; the claimed row carries them
+NODE_LISTING_COLUMNS = (
+    "node_id,seller_address,gpu_type,device_name,vram_gb,num_gpus,"
+    "price_per_hour,is_available,last_heartbeat,p2p_url"
+)
+PENDING_JOB_COLUMNS = (
+    "job_id,buyer_address,status,required_gpu_type,min_vram_gb,"
+    "max_price_per_hour,num_gpus,timeout_seconds,created_at"
+)
+
+# Outputs larger than this (in characters) go to object storage; the jobs row
+# keeps only the leading RESULT_OUTPUT_INLINE_LIMIT characters as a preview
+RESULT_OUTPUT_INLINE_LIMIT = 64 * 1024
+
+# Retries for requests that failed before reaching PostgREST (safe to resend),
+# with exponential backoff starting at RETRY_BASE_DELAY seconds
+MAX_REQUEST_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.05
+_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Rows per INSERT request when bulk-writing job metrics
+METRICS_INSERT_BATCH_SIZE = 1000
+
+# TTLs (seconds) for read-heavy listings served from DatabaseClient's result cache
+ACTIVE_NODES_CACHE_TTL = 1.0
+STATS_CACHE_TTL = 5.0
+# and for by-id lookups (seller profiles, experiments, models)
+ENTITY_CACHE_TTL = 10.0
+READ_CACHE_MAX_ENTRIES = 1024
+
+# (millisecond, ISO string) of the last timestamp handed out by _now_iso
+_ts_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO string, formatted at most once per millisecond"""
+    global _ts_cache
+    ms = time.time_ns() // 1_000_000
+    if ms != _ts_cache[0]:
+        _ts_cache = (ms, datetime.utcfromtimestamp(ms / 1000).isoformat(timespec="milliseconds"))
+    return _ts_cache[1]
+
+
+def _copy_rows(data: Any) -> Any:
+    """Shallow-copy a cached row or list of rows for a caller"""
+    if isinstance(data, list):
+        return [dict(row) for row in data]
+    if isinstance(data, dict):
+        return dict(data)
+    return data
+
 
 class DatabaseClient:
     """
     Thread-safe Supabase client for ComputeSwarm operations
+
+    The hot paths don't need client-side prepared statements: claim_job and
+    heartbeat_many are PL/pgSQL functions whose plans Postgres caches per
+    backend, and PostgREST prepares the statements it generates for table
+    queries such as get_pending_jobs (db-prepared-statements, on by default)
     """
 
-    def __init__(self, supabase_url: str, supabase_key: str):
+    def __init__(self, supabase_url: str, supabase_key: str, max_concurrency: int = 50):
         """Initialize Supabase client"""
-        self.client: Client = create_client(supabase_url, supabase_key)
+        # Async client: queries are awaited on the event loop over one long-lived
+        # httpx.AsyncClient that keeps connections alive between requests
+        self.client: AsyncClient = AsyncClient(supabase_url, supabase_key)
+        # Caps in-flight requests so bursts queue here instead of at PostgREST
+        self._request_semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Buffered heartbeats keyed by node_id -> (available, p2p_url); latest wins
+        self._pending_heartbeats: Dict[str, tuple] = {}
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+        # Short-lived result cache: key -> (expires_at, data). Node listing keys
+        # include _nodes_version, which node writes bump to invalidate them
+        self._read_cache: Dict[tuple, tuple] = {}
+        self._read_inflight: Dict[tuple, asyncio.Future] = {}
+        self._nodes_version = 0
+
+    async def _execute(self, query: Any) -> Any:
+        """Execute a PostgREST query/RPC builder and return its response"""
+        async with self._request_semaphore:
+            for attempt in range(MAX_REQUEST_ATTEMPTS):
+                try:
+                    return await query.execute()
+                except _RETRYABLE_ERRORS as e:
+                    if attempt == MAX_REQUEST_ATTEMPTS - 1:
+                        raise
+                    logger.warning("supabase_request_retry", attempt=attempt + 1, error=str(e))
+                    await asyncio.sleep(RETRY_BASE_DELAY * 2 ** attempt)
+
+    async def _cached(self, key: tuple, ttl: float, fetch) -> Any:
+        """
+        Return the cached result for key, awaiting fetch() on a miss or expiry
+
+        fetch() returns a row dict, a list of row dicts or None. Callers get
+        shallow copies of the rows, so adding or replacing fields can't
+        corrupt the cache. None (row not found) is never cached, so a row
+        created right after a miss is seen on the next read.
+        """
+        entry = self._read_cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return _copy_rows(entry[1])
+
+        # Concurrent misses for the same key share one fetch; other keys
+        # don't wait on it
+        inflight = self._read_inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fill_cache(key, ttl, fetch))
+            self._read_inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._read_inflight.pop(key, None))
+        return _copy_rows(await asyncio.shield(inflight))
+
+    async def _fill_cache(self, key: tuple, ttl: float, fetch) -> Any:
+        """Fetch and store the result for key"""
+        data = await fetch()
+        if data is None:
+            return None
+        now = time.monotonic()
+        self._read_cache.pop(key, None)
+        if len(self._read_cache) >= READ_CACHE_MAX_ENTRIES:
+            for k in [k for k, v in self._read_cache.items() if v[0] <= now]:
+                del self._read_cache[k]
+            if len(self._read_cache) >= READ_CACHE_MAX_ENTRIES:
+                # Evict the oldest insertion
+                del self._read_cache[next(iter(self._read_cache))]
+        self._read_cache[key] = (now + ttl, data)
+        return data
+
+    async def _fetch_one(self, query: Any) -> Optional[Dict[str, Any]]:
+        """Execute a query and return its first row, if any"""
+        result = await self._execute(query)
+        return result.data[0] if result.data else None
+
+    async def _fetch_all(self, query: Any) -> List[Dict[str, Any]]:
+        """Execute a query and return its rows"""
+        result = await self._execute(query)
+        return result.data or []
+
+    def _invalidate_nodes(self) -> None:
+        """Make cached node listings stale after a node write"""
+        self._nodes_version += 1
 
     # ===== NODE OPERATIONS =====
 
@@ -30,8 +184,7 @@ class DatabaseClient:
         Register or update a compute node
         Uses upsert to handle both new and existing nodes
         """
-        # Convert GPU type to uppercase to match database enum (CUDA, MPS, CPU)
-        gpu_type_upper = node.gpu_info.gpu_type.value.upper()
+        gpu_type_upper = GPU_TYPE_DB[node.gpu_info.gpu_type]
         
         node_data = {
             "node_id": node.node_id,
@@ -43,7 +196,7 @@ class DatabaseClient:
             "compute_capability": node.gpu_info.compute_capability,
             "price_per_hour": float(node.price_per_hour),
             "is_available": node.is_available,
-            "last_heartbeat": datetime.utcnow().isoformat(),
+            "last_heartbeat": _now_iso(),
         }
 
         if node.seller_profile_id:
@@ -52,48 +205,111 @@ class DatabaseClient:
         if node.p2p_url:
             node_data["p2p_url"] = node.p2p_url
 
-        result = self.client.table("compute_nodes").upsert(node_data).execute()
+        result = await self._execute(self.client.table("compute_nodes").upsert(node_data))
+        self._invalidate_nodes()
         return node
 
 
-    async def update_node_heartbeat(self, node_id: str, p2p_url: Optional[str] = None) -> None:
-        """Update node's last heartbeat timestamp and optionally P2P URL"""
-        data = {
-            "last_heartbeat": datetime.utcnow().isoformat(),
-            "is_available": True
-        }
-        
-        if p2p_url:
-            data["p2p_url"] = p2p_url
-            
-        self.client.table("compute_nodes").update(data).eq("node_id", node_id).execute()
+    async def update_node_heartbeat(
+        self,
+        node_id: str,
+        p2p_url: Optional[str] = None,
+        available: bool = True
+    ) -> None:
+        """
+        Queue a heartbeat (availability and optionally P2P URL) for the node
+
+        Heartbeats are coalesced per node and written in one heartbeat_many RPC
+        every HEARTBEAT_FLUSH_INTERVAL seconds instead of one UPDATE per call.
+        A node reporting itself unavailable is written immediately, so it stops
+        being matched with jobs right away
+        """
+        if not available:
+            self._pending_heartbeats.pop(node_id, None)
+            update = {"is_available": False, "last_heartbeat": _now_iso()}
+            if p2p_url:
+                update["p2p_url"] = p2p_url
+            await self._execute(self.client.table("compute_nodes").update(update).eq("node_id", node_id))
+            self._invalidate_nodes()
+            return
+
+        self._pending_heartbeats[node_id] = (available, p2p_url or None)
+
+        task = self._heartbeat_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_flush_loop())
+
+    async def _heartbeat_flush_loop(self) -> None:
+        """Flush buffered heartbeats until the buffer stays empty for an interval"""
+        while True:
+            await asyncio.sleep(HEARTBEAT_FLUSH_INTERVAL)
+            if not self._pending_heartbeats:
+                self._heartbeat_task = None
+                return
+            await self.flush_heartbeats()
+
+    async def flush_heartbeats(self) -> int:
+        """Write all buffered heartbeats in a single RPC, returns number of nodes sent"""
+        if not self._pending_heartbeats:
+            return 0
 
+        pending, self._pending_heartbeats = self._pending_heartbeats, {}
+        node_ids = list(pending)
+        try:
+            await self._execute(self.client.rpc("heartbeat_many", {
+                "p_node_ids": node_ids,
+                "p_available": [pending[n][0] for n in node_ids],
+                "p_p2p_urls": [pending[n][1] for n in node_ids]
+            }))
+        except Exception as e:
+            # Retry with the next flush, unless a newer heartbeat arrived meanwhile
+            for node_id, heartbeat in pending.items():
+                self._pending_heartbeats.setdefault(node_id, heartbeat)
+            logger.error("heartbeat_flush_failed", count=len(node_ids), error=str(e))
+        return len(node_ids)
 
     async def set_node_availability(self, node_id: str, available: bool) -> None:
         """Set node availability status"""
-        self.client.table("compute_nodes").update({
+        # Written immediately; drop any buffered heartbeat so it can't overwrite this
+        self._pending_heartbeats.pop(node_id, None)
+        await self._execute(self.client.table("compute_nodes").update({
             "is_available": available,
-            "last_heartbeat": datetime.utcnow().isoformat()
-        }).eq("node_id", node_id).execute()
+            "last_heartbeat": _now_iso()
+        }).eq("node_id", node_id))
+        self._invalidate_nodes()
 
     async def get_node(self, node_id: str) -> Optional[Dict[str, Any]]:
         """Get node by ID"""
-        result = self.client.table("compute_nodes").select("*").eq("node_id", node_id).execute()
+        result = await self._execute(self.client.table("compute_nodes").select("*").eq("node_id", node_id))
         return result.data[0] if result.data else None
 
     async def get_active_nodes(
         self,
         gpu_type: Optional[GPUType] = None,
         max_price: Optional[Decimal] = None,
-        min_vram: Optional[Decimal] = None
+        min_vram: Optional[Decimal] = None,
+        min_num_gpus: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Get all active nodes (heartbeat within last 5 minutes)
-        with optional filters
+        with optional filters. Results are cached for ACTIVE_NODES_CACHE_TTL
         """
+        key = ("active_nodes", self._nodes_version, gpu_type, max_price, min_vram, min_num_gpus)
+        return await self._cached(
+            key, ACTIVE_NODES_CACHE_TTL,
+            lambda: self._fetch_active_nodes(gpu_type, max_price, min_vram, min_num_gpus)
+        )
+
+    async def _fetch_active_nodes(
+        self,
+        gpu_type: Optional[GPUType],
+        max_price: Optional[Decimal],
+        min_vram: Optional[Decimal],
+        min_num_gpus: Optional[int]
+    ) -> List[Dict[str, Any]]:
         cutoff = (datetime.utcnow() - timedelta(minutes=5)).isoformat()
 
-        query = self.client.table("compute_nodes").select("*").gte("last_heartbeat", cutoff).eq("is_available", True)
+        query = self.client.table("compute_nodes").select(NODE_LISTING_COLUMNS).gte("last_heartbeat", cutoff).eq("is_available", True)
 
         if gpu_type:
             query = query.eq("gpu_type", gpu_type.value)
@@ -101,8 +317,10 @@ class DatabaseClient:
             query = query.lte("price_per_hour", float(max_price))
         if min_vram:
             query = query.gte("vram_gb", float(min_vram))
+        if min_num_gpus and min_num_gpus > 1:
+            query = query.gte("num_gpus", min_num_gpus)
 
-        result = query.order("price_per_hour").execute()
+        result = await self._execute(query.order("price_per_hour"))
         return result.data
 
     # ===== JOB OPERATIONS =====
@@ -118,7 +336,7 @@ class DatabaseClient:
             "requirements": job.requirements,
             "max_price_per_hour": float(job.max_price_per_hour),
             "timeout_seconds": job.timeout_seconds,
-            "required_gpu_type": job.required_gpu_type.value.upper() if job.required_gpu_type else None,
+            "required_gpu_type": GPU_TYPE_DB[job.required_gpu_type] if job.required_gpu_type else None,
             "min_vram_gb": float(job.min_vram_gb) if job.min_vram_gb else None,
             "num_gpus": job.num_gpus,
             "gpu_memory_limit_per_gpu": job.gpu_memory_limit_per_gpu,
@@ -130,7 +348,7 @@ class DatabaseClient:
         if hasattr(job, 'experiment_id') and job.experiment_id:
             job_data["experiment_id"] = job.experiment_id
 
-        result = self.client.table("jobs").insert(job_data).execute()
+        result = await self._execute(self.client.table("jobs").insert(job_data))
         return result.data[0]["job_id"]
 
     async def claim_job(
@@ -144,23 +362,22 @@ class DatabaseClient:
     ) -> Optional[Dict[str, Any]]:
         """
         Atomically claim the next available job that matches seller's capabilities
-        Uses Supabase RPC to call the claim_job PostgreSQL function
+        Uses Supabase RPC to call the claim_job PostgreSQL function, which
+        returns the complete job row
         """
         try:
-            result = self.client.rpc(
+            result = await self._execute(self.client.rpc(
                 "claim_job",
                 {
                     "p_node_id": node_id,
                     "p_seller_address": seller_address,
-                    "p_gpu_type": gpu_type.value.upper(),  # Convert to uppercase for database enum
+                    "p_gpu_type": GPU_TYPE_DB[gpu_type],
                     "p_price_per_hour": float(price_per_hour),
                     "p_vram_gb": float(vram_gb),
                     "p_num_gpus": num_gpus
                 }
-            ).execute()
+            ))
         except Exception as e:
-            import structlog
-            logger = structlog.get_logger()
             logger.error(
                 "claim_job_rpc_failed",
                 error=str(e),
@@ -171,8 +388,6 @@ class DatabaseClient:
             raise
 
         # Log what we got back from the SQL function
-        import structlog
-        logger = structlog.get_logger()
         if result.data:
             logger.debug(
                 "claim_job_rpc_success",
@@ -191,50 +406,19 @@ class DatabaseClient:
             )
 
         if result.data:
-            job_data = result.data[0]
-            # The SQL function already returns all necessary fields
-            # Convert job_id to string (it comes as TEXT from SQL function but DB stores as UUID)
-            job_id = str(job_data["job_id"])
-            
-            # Try to get full job details, but if it fails, use the data from the SQL function
-            # This handles the case where job_id format doesn't match exactly
-            full_job = await self.get_job(job_id)
-            if full_job:
-                return full_job
-            
-            # If get_job fails, use the data from SQL function directly
-            # The SQL function returns: job_id, script, requirements, timeout_seconds, 
-            # max_price_per_hour, buyer_address, job_type, docker_image
-            import structlog
-            logger = structlog.get_logger()
-            logger.warning(
-                "claim_job_get_job_failed_using_rpc_data",
-                job_id=job_id,
-                rpc_result=job_data
-            )
-            
-            # Build job dict from SQL function result
-            # job_id from SQL function is TEXT, but we need to ensure it's a valid UUID string
-            return {
-                "job_id": job_id,
-                "script": job_data.get("script", ""),
-                "requirements": job_data.get("requirements"),
-                "timeout_seconds": job_data.get("timeout_seconds", 3600),
-                "max_price_per_hour": Decimal(str(job_data.get("max_price_per_hour", 0))),
-                "buyer_address": job_data.get("buyer_address", ""),
-                "job_type": job_data.get("job_type", "batch_job"),
-                "docker_image": job_data.get("docker_image"),
-                "num_gpus": job_data.get("num_gpus", 1),
-                "gpu_memory_limit_per_gpu": job_data.get("gpu_memory_limit_per_gpu")
-            }
+            # claim_job returns the full claimed row (migration_claim_job_returns_row.sql),
+            # so no follow-up get_job() round-trip is needed
+            job = result.data[0]
+            job["job_id"] = str(job["job_id"])
+            return job
         return None
 
     async def start_job_execution(self, job_id: str) -> None:
         """Mark job as executing"""
-        self.client.table("jobs").update({
+        await self._execute(self.client.table("jobs").update({
             "status": "EXECUTING",
-            "started_at": datetime.utcnow().isoformat()
-        }).eq("job_id", job_id).execute()
+            "started_at": _now_iso()
+        }).eq("job_id", job_id))
 
     async def complete_job(
         self,
@@ -245,16 +429,36 @@ class DatabaseClient:
         total_cost: Decimal,
         payment_tx_hash: Optional[str] = None
     ) -> None:
-        """Mark job as completed with results"""
-        self.client.table("jobs").update({
+        """
+        Mark job as completed with results
+        
+        Outputs over RESULT_OUTPUT_INLINE_LIMIT are uploaded to storage and
+        referenced by result_output_path; result_output then holds a preview
+        """
+        update_data = {
             "status": "COMPLETED",
             "result_output": output,
             "exit_code": exit_code,
             "execution_duration_seconds": float(execution_duration),
             "total_cost_usd": float(total_cost),
             "payment_tx_hash": payment_tx_hash,
-            "completed_at": datetime.utcnow().isoformat()
-        }).eq("job_id", job_id).execute()
+            "completed_at": _now_iso()
+        }
+        
+        if output and len(output) > RESULT_OUTPUT_INLINE_LIMIT:
+            storage_path = f"output/{job_id}/result_output.txt"
+            try:
+                from src.storage import get_storage_client
+                await get_storage_client().upload_bytes(
+                    output.encode("utf-8"), storage_path, content_type="text/plain"
+                )
+                update_data["result_output"] = output[:RESULT_OUTPUT_INLINE_LIMIT]
+                update_data["result_output_path"] = storage_path
+            except Exception as e:
+                # Keep the full output inline rather than lose it
+                logger.warning("result_output_upload_failed", job_id=job_id, error=str(e))
+        
+        await self._execute(self.client.table("jobs").update(update_data).eq("job_id", job_id))
 
     async def fail_job(
         self,
@@ -267,7 +471,7 @@ class DatabaseClient:
         update_data = {
             "status": "FAILED",
             "result_error": error,
-            "completed_at": datetime.utcnow().isoformat()
+            "completed_at": _now_iso()
         }
 
         if exit_code is not None:
@@ -275,7 +479,7 @@ class DatabaseClient:
         if execution_duration is not None:
             update_data["execution_duration_seconds"] = float(execution_duration)
 
-        self.client.table("jobs").update(update_data).eq("job_id", job_id).execute()
+        await self._execute(self.client.table("jobs").update(update_data).eq("job_id", job_id))
 
     async def cancel_job(self, job_id: str, buyer_address: str) -> bool:
         """
@@ -283,16 +487,16 @@ class DatabaseClient:
         Returns True if cancelled, False if job not found or not cancellable
         """
         # Only allow cancelling PENDING or CLAIMED jobs
-        result = self.client.table("jobs").update({
+        result = await self._execute(self.client.table("jobs").update({
             "status": "CANCELLED",
-            "completed_at": datetime.utcnow().isoformat()
-        }).eq("job_id", job_id).eq("buyer_address", buyer_address).in_("status", ["PENDING", "CLAIMED"]).execute()
+            "completed_at": _now_iso()
+        }).eq("job_id", job_id).eq("buyer_address", buyer_address).in_("status", ["PENDING", "CLAIMED"]))
 
         return len(result.data) > 0
 
     async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get job by ID"""
-        result = self.client.table("jobs").select("*").eq("job_id", job_id).execute()
+        result = await self._execute(self.client.table("jobs").select("*").eq("job_id", job_id))
         return result.data[0] if result.data else None
 
     async def get_jobs_by_buyer(
@@ -301,13 +505,12 @@ class DatabaseClient:
         status: Optional[JobStatus] = None,
         limit: int = 50
     ) -> List[Dict[str, Any]]:
-        """Get jobs submitted by a buyer"""
-        query = self.client.table("jobs").select("*").eq("buyer_address", buyer_address)
-
-        if status:
-            query = query.eq("status", status.value)
-
-        result = query.order("created_at", desc=True).limit(limit).execute()
+        """Get jobs submitted by a buyer (newest first)"""
+        result = await self._execute(self.client.rpc("jobs_by_buyer", {
+            "p_buyer": buyer_address,
+            "p_status": status.value if status else None,
+            "p_limit": limit
+        }))
         return result.data
 
     async def get_jobs_by_seller(
@@ -316,27 +519,40 @@ class DatabaseClient:
         status: Optional[JobStatus] = None,
         limit: int = 50
     ) -> List[Dict[str, Any]]:
-        """Get jobs assigned to a seller"""
-        query = self.client.table("jobs").select("*").eq("seller_address", seller_address)
-
-        if status:
-            query = query.eq("status", status.value)
-
-        result = query.order("claimed_at", desc=True).limit(limit).execute()
+        """Get jobs assigned to a seller (most recently claimed first)"""
+        result = await self._execute(self.client.rpc("jobs_by_seller", {
+            "p_seller": seller_address,
+            "p_status": status.value if status else None,
+            "p_limit": limit
+        }))
         return result.data
 
     async def get_pending_jobs(
         self,
         gpu_type: Optional[GPUType] = None,
-        limit: int = 100
+        limit: int = 100,
+        price_per_hour: Optional[Decimal] = None,
+        vram_gb: Optional[Decimal] = None,
+        num_gpus: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get pending jobs in queue"""
-        query = self.client.table("jobs").select("*").eq("status", "PENDING")
+        """
+        Get pending jobs in queue
 
-        if gpu_type:
-            query = query.or_(f"required_gpu_type.is.null,required_gpu_type.eq.{gpu_type.value}")
+        price_per_hour, vram_gb and num_gpus describe a node; when given, only jobs
+        that node could claim are returned (same matching rules as claim_job)
+        """
+        query = self.client.table("jobs").select(PENDING_JOB_COLUMNS).eq("status", "PENDING")
 
-        result = query.order("created_at").limit(limit).execute()
+        if gpu_type:
+            query = query.or_(_PENDING_GPU_FILTERS[gpu_type])
+        if price_per_hour is not None:
+            query = query.gte("max_price_per_hour", float(price_per_hour))
+        if vram_gb is not None:
+            query = query.or_(f"min_vram_gb.is.null,min_vram_gb.lte.{float(vram_gb)}")
+        if num_gpus is not None:
+            query = query.lte("num_gpus", num_gpus)
+
+        result = await self._execute(query.order("created_at").limit(limit))
         return result.data
 
     # ===== MAINTENANCE OPERATIONS =====
@@ -346,7 +562,7 @@ class DatabaseClient:
         Release jobs that were claimed but never started
         Returns number of jobs released
         """
-        result = self.client.rpc("release_stale_claims", {"stale_minutes": stale_minutes}).execute()
+        result = await self._execute(self.client.rpc("release_stale_claims", {"stale_minutes": stale_minutes}))
         return result.data
 
     async def mark_stale_executions_failed(self, timeout_multiplier: float = 2.0) -> int:
@@ -354,34 +570,58 @@ class DatabaseClient:
         Mark executing jobs as failed if they've exceeded timeout
         Returns number of jobs marked as failed
         """
-        result = self.client.rpc("mark_stale_executions_failed", {"timeout_multiplier": timeout_multiplier}).execute()
+        result = await self._execute(self.client.rpc("mark_stale_executions_failed", {"timeout_multiplier": timeout_multiplier}))
         return result.data
 
+    async def run_maintenance(
+        self,
+        stale_minutes: int = 5,
+        timeout_multiplier: float = 2.0
+    ) -> tuple:
+        """
+        Release stale claims and fail overdue executions in one RPC
+        Returns (jobs released, jobs marked as failed)
+        """
+        result = await self._execute(self.client.rpc("run_maintenance", {
+            "stale_minutes": stale_minutes,
+            "timeout_multiplier": timeout_multiplier
+        }))
+        row = result.data[0] if result.data else {}
+        return row.get("released") or 0, row.get("failed") or 0
+
     # ===== STATISTICS =====
 
     async def get_queue_stats(self) -> List[Dict[str, Any]]:
-        """Get queue statistics by status"""
-        result = self.client.table("queue_stats").select("*").execute()
-        return result.data
+        """Get queue statistics by status (cached for STATS_CACHE_TTL)"""
+        return await self._cached(
+            ("queue_stats",), STATS_CACHE_TTL,
+            lambda: self._fetch_all(self.client.table("queue_stats").select("*"))
+        )
 
     async def get_active_sellers_view(self) -> List[Dict[str, Any]]:
-        """Get active sellers view"""
-        result = self.client.table("active_sellers").select("*").execute()
-        return result.data
+        """Get active sellers view (cached for STATS_CACHE_TTL)"""
+        return await self._cached(
+            ("active_sellers",), STATS_CACHE_TTL,
+            lambda: self._fetch_all(self.client.table("active_sellers").select("*"))
+        )
 
     async def get_job_state_transitions(self, job_id: str) -> List[Dict[str, Any]]:
         """Get state transition history for a job (audit trail)"""
-        result = self.client.table("job_state_transitions").select("*").eq("job_id", job_id).order("transitioned_at").execute()
+        # Served in order by idx_transitions_job (job_id, transitioned_at), schema.sql
+        result = await self._execute(self.client.table("job_state_transitions").select("*").eq("job_id", job_id).order("transitioned_at"))
         return result.data
 
     # ===== SELLER PROFILE OPERATIONS =====
 
     async def get_seller_profile(self, seller_address: str) -> Optional[Dict[str, Any]]:
-        """Get seller profile by address"""
-        result = self.client.table("seller_profiles").select("*").eq(
-            "seller_address", seller_address.lower()
-        ).execute()
-        return result.data[0] if result.data else None
+        """Get seller profile by address (cached for ENTITY_CACHE_TTL)"""
+        seller_address = seller_address.lower()
+        return await self._cached(
+            ("seller_profile", seller_address), ENTITY_CACHE_TTL,
+            lambda: self._fetch_one(self.client.table("seller_profiles").select("*").eq(
+                "seller_address", seller_address
+            ))
+        )
 
     async def upsert_seller_profile_from_github(
         self,
@@ -399,14 +639,15 @@ class DatabaseClient:
             "github_avatar_url": github_avatar_url,
             "github_profile_url": github_profile_url,
             "verification_status": "verified",
-            "verified_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "verified_at": _now_iso(),
+            "updated_at": _now_iso()
         }
         
-        result = self.client.table("seller_profiles").upsert(
+        result = await self._execute(self.client.table("seller_profiles").upsert(
             profile_data, 
             on_conflict="seller_address"
-        ).execute()
+        ))
+        self._read_cache.pop(("seller_profile", seller_address.lower()), None)
         
         return result.data[0]["id"] if result.data else None
 
@@ -416,10 +657,11 @@ class DatabaseClient:
         updates: Dict[str, Any]
     ) -> None:
         """Update seller profile fields"""
-        updates["updated_at"] = datetime.utcnow().isoformat()
-        self.client.table("seller_profiles").update(updates).eq(
+        updates["updated_at"] = _now_iso()
+        await self._execute(self.client.table("seller_profiles").update(updates).eq(
             "seller_address", seller_address.lower()
-        ).execute()
+        ))
+        self._read_cache.pop(("seller_profile", seller_address.lower()), None)
 
     async def add_seller_rating(
         self,
@@ -438,7 +680,8 @@ class DatabaseClient:
             "comment": comment
         }
         
-        result = self.client.table("seller_ratings").insert(rating_data).execute()
+        result = await self._execute(self.client.table("seller_ratings").insert(rating_data))
+        self._read_cache.pop(("seller_profile", seller_address.lower()), None)
         
         # Update seller's reputation score (trigger should handle this, but we can do it here too)
         return result.data[0]["id"] if result.data else None
@@ -462,12 +705,34 @@ class DatabaseClient:
         Returns:
             Number of metrics saved
         """
-        import structlog
-        logger = structlog.get_logger()
         
         if not metrics:
             return 0
         
+        metrics_data = self._metric_rows(job_id, metrics, experiment_id)
+        
+        try:
+            # Multi-row inserts in fixed-size batches; returning=minimal skips echoing
+            # every inserted row back in the response
+            for i in range(0, len(metrics_data), METRICS_INSERT_BATCH_SIZE):
+                await self._execute(self.client.table("job_metrics").insert(
+                    metrics_data[i:i + METRICS_INSERT_BATCH_SIZE],
+                    returning=ReturnMethod.minimal
+                ))
+            saved_count = len(metrics_data)
+            logger.info("job_metrics_saved", job_id=job_id, count=saved_count, experiment_id=experiment_id)
+            return saved_count
+        except Exception as e:
+            logger.error("job_metrics_save_failed", job_id=job_id, error=str(e))
+            raise
+
+    @staticmethod
+    def _metric_rows(
+        job_id: str,
+        metrics: List[Dict[str, Any]],
+        experiment_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Build job_metrics rows from collected metric dicts"""
         metrics_data = []
         for metric in metrics:
             metric_data = {
@@ -485,15 +750,7 @@ class DatabaseClient:
                 metric_data["timestamp"] = metric["timestamp"]
             
             metrics_data.append(metric_data)
-        
-        try:
-            result = self.client.table("job_metrics").insert(metrics_data).execute()
-            saved_count = len(result.data) if result.data else len(metrics_data)
-            logger.info("job_metrics_saved", job_id=job_id, count=saved_count, experiment_id=experiment_id)
-            return saved_count
-        except Exception as e:
-            logger.error("job_metrics_save_failed", job_id=job_id, error=str(e))
-            raise
+        return metrics_data
 
     async def get_job_metrics(
         self,
@@ -517,7 +774,7 @@ class DatabaseClient:
         
         query = query.order("timestamp", desc=False)
         
-        result = query.execute()
+        result = await self._execute(query)
         return result.data if result.data else []
 
     async def create_experiment(
@@ -541,8 +798,6 @@ class DatabaseClient:
         Returns:
             Experiment ID
         """
-        import structlog
-        logger = structlog.get_logger()
         
         experiment_data = {
             "buyer_address": buyer_address,
@@ -553,7 +808,7 @@ class DatabaseClient:
             "status": "active"
         }
         
-        result = self.client.table("experiments").insert(experiment_data).execute()
+        result = await self._execute(self.client.table("experiments").insert(experiment_data))
         
         if result.data:
             experiment_id = result.data[0]["id"]
@@ -563,9 +818,11 @@ class DatabaseClient:
             raise Exception("Failed to create experiment")
 
     async def get_experiment(self, experiment_id: str) -> Optional[Dict[str, Any]]:
-        """Get experiment by ID"""
-        result = self.client.table("experiments").select("*").eq("id", experiment_id).execute()
-        return result.data[0] if result.data else None
+        """Get experiment by ID (cached for ENTITY_CACHE_TTL)"""
+        return await self._cached(
+            ("experiment", experiment_id), ENTITY_CACHE_TTL,
+            lambda: self._fetch_one(self.client.table("experiments").select("*").eq("id", experiment_id))
+        )
 
     async def list_experiments(
         self,
@@ -594,7 +851,7 @@ class DatabaseClient:
         
         query = query.order("created_at", desc=True).limit(limit)
         
-        result = query.execute()
+        result = await self._execute(query)
         return result.data if result.data else []
 
     async def save_checkpoint(
@@ -630,9 +887,72 @@ class DatabaseClient:
         Returns:
             Checkpoint ID
         """
-        import structlog
-        logger = structlog.get_logger()
         
+        checkpoint_data = self._checkpoint_row(
+            job_id, storage_path, file_size_bytes,
+            checkpoint_name=checkpoint_name, epoch=epoch, step=step, loss=loss,
+            metric_values=metric_values, description=description,
+            experiment_id=experiment_id, checksum=checksum
+        )
+        
+        result = await self._execute(self.client.table("checkpoints").insert(checkpoint_data))
+        
+        if result.data:
+            checkpoint_id = result.data[0]["id"]
+            logger.info("checkpoint_saved", checkpoint_id=checkpoint_id, job_id=job_id, epoch=epoch, step=step)
+            return checkpoint_id
+        else:
+            raise Exception("Failed to save checkpoint")
+
+    async def save_checkpoints_bulk(self, checkpoints: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Save metadata for several checkpoints in one insert
+        
+        Args:
+            checkpoints: List of dicts with save_checkpoint's keyword arguments
+            
+        Returns:
+            Checkpoint IDs in input order; None for rows that failed to save
+        """
+        if not checkpoints:
+            return []
+        
+        rows = [self._checkpoint_row(**checkpoint) for checkpoint in checkpoints]
+        
+        try:
+            result = await self._execute(self.client.table("checkpoints").insert(rows))
+            if result.data and len(result.data) == len(rows):
+                checkpoint_ids = [row["id"] for row in result.data]
+                logger.info("checkpoints_saved", count=len(checkpoint_ids), job_id=rows[0]["job_id"])
+                return checkpoint_ids
+        except Exception as e:
+            logger.warning("checkpoint_bulk_insert_failed", count=len(rows), error=str(e))
+        
+        # Fall back to one insert per row so a single bad row doesn't lose the batch
+        checkpoint_ids: List[Optional[str]] = []
+        for checkpoint in checkpoints:
+            try:
+                checkpoint_ids.append(await self.save_checkpoint(**checkpoint))
+            except Exception as e:
+                logger.error("checkpoint_save_failed", job_id=checkpoint.get("job_id"), error=str(e))
+                checkpoint_ids.append(None)
+        return checkpoint_ids
+
+    @staticmethod
+    def _checkpoint_row(
+        job_id: str,
+        storage_path: str,
+        file_size_bytes: int,
+        checkpoint_name: Optional[str] = None,
+        epoch: Optional[int] = None,
+        step: Optional[int] = None,
+        loss: Optional[float] = None,
+        metric_values: Optional[Dict[str, Any]] = None,
+        description: Optional[str] = None,
+        experiment_id: Optional[str] = None,
+        checksum: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build a checkpoints row (see save_checkpoint for the arguments)"""
         checkpoint_data = {
             "job_id": job_id,
             "storage_path": storage_path,
@@ -648,15 +968,7 @@ class DatabaseClient:
         
         if experiment_id:
             checkpoint_data["experiment_id"] = experiment_id
-        
-        result = self.client.table("checkpoints").insert(checkpoint_data).execute()
-        
-        if result.data:
-            checkpoint_id = result.data[0]["id"]
-            logger.info("checkpoint_saved", checkpoint_id=checkpoint_id, job_id=job_id, epoch=epoch, step=step)
-            return checkpoint_id
-        else:
-            raise Exception("Failed to save checkpoint")
+        return checkpoint_data
 
     async def list_checkpoints(
         self,
@@ -681,14 +993,16 @@ class DatabaseClient:
         if experiment_id:
             query = query.eq("experiment_id", experiment_id)
         
+        # Sort comes from idx_checkpoints_job (job_id, created_at DESC) and
+        # idx_checkpoints_experiment_created (experiment_id, created_at DESC)
         query = query.order("created_at", desc=True)
         
-        result = query.execute()
+        result = await self._execute(query)
         return result.data if result.data else []
 
     async def get_checkpoint(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
         """Get checkpoint by ID"""
-        result = self.client.table("checkpoints").select("*").eq("id", checkpoint_id).execute()
+        result = await self._execute(self.client.table("checkpoints").select("*").eq("id", checkpoint_id))
         return result.data[0] if result.data else None
 
     async def save_model(
@@ -700,7 +1014,7 @@ class DatabaseClient:
         storage_path: str,
         file_size_bytes: int,
         checksum: Optional[str] = None,
-        format: Optional[str] = None,
+        model_format: Optional[str] = None,
         architecture: Optional[str] = None,
         framework: Optional[str] = None,
         metrics: Optional[Dict[str, Any]] = None,
@@ -718,7 +1032,7 @@ class DatabaseClient:
             storage_path: Path in storage
             file_size_bytes: File size
             checksum: Optional checksum
-            format: Model format (pt, pth, safetensors, onnx, h5)
+            model_format: Model format (pt, pth, safetensors, onnx, h5)
             architecture: Model architecture
             framework: Framework (pytorch, tensorflow, etc.)
             metrics: Optional metrics dict
@@ -728,9 +1042,40 @@ class DatabaseClient:
         Returns:
             Model ID
         """
-        import structlog
-        logger = structlog.get_logger()
         
+        model_data = self._model_row(
+            job_id, buyer_address, name, version, storage_path, file_size_bytes,
+            checksum=checksum, model_format=model_format, architecture=architecture,
+            framework=framework, metrics=metrics, description=description,
+            experiment_id=experiment_id
+        )
+        
+        result = await self._execute(self.client.table("models").insert(model_data))
+        
+        if result.data:
+            model_id = result.data[0]["id"]
+            logger.info("model_saved", model_id=model_id, name=name, version=version, buyer=buyer_address)
+            return model_id
+        else:
+            raise Exception("Failed to save model")
+
+    @staticmethod
+    def _model_row(
+        job_id: str,
+        buyer_address: str,
+        name: str,
+        version: str,
+        storage_path: str,
+        file_size_bytes: int,
+        checksum: Optional[str] = None,
+        model_format: Optional[str] = None,
+        architecture: Optional[str] = None,
+        framework: Optional[str] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        description: Optional[str] = None,
+        experiment_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Build a models row (see save_model for the arguments); unset optional columns are omitted"""
         model_data = {
             "job_id": job_id,
             "buyer_address": buyer_address,
@@ -738,26 +1083,19 @@ class DatabaseClient:
             "version": version,
             "storage_path": storage_path,
             "file_size_bytes": file_size_bytes,
+            "status": "active"
+        }
+        optional = {
             "checksum": checksum,
-            "format": format,
+            "format": model_format,
             "architecture": architecture,
             "framework": framework,
             "metrics": metrics,
             "description": description,
-            "status": "active"
+            "experiment_id": experiment_id
         }
-        
-        if experiment_id:
-            model_data["experiment_id"] = experiment_id
-        
-        result = self.client.table("models").insert(model_data).execute()
-        
-        if result.data:
-            model_id = result.data[0]["id"]
-            logger.info("model_saved", model_id=model_id, name=name, version=version, buyer=buyer_address)
-            return model_id
-        else:
-            raise Exception("Failed to save model")
+        model_data.update({k: v for k, v in optional.items() if v is not None})
+        return model_data
 
     async def list_models(
         self,
@@ -786,17 +1124,20 @@ class DatabaseClient:
         
         query = query.order("created_at", desc=True).limit(limit)
         
-        result = query.execute()
+        result = await self._execute(query)
         return result.data if result.data else []
 
     async def get_model(self, model_id: str) -> Optional[Dict[str, Any]]:
-        """Get model by ID"""
-        result = self.client.table("models").select("*").eq("id", model_id).execute()
-        return result.data[0] if result.data else None
+        """Get model by ID (cached for ENTITY_CACHE_TTL)"""
+        return await self._cached(
+            ("model", model_id), ENTITY_CACHE_TTL,
+            lambda: self._fetch_one(self.client.table("models").select("*").eq("id", model_id))
+        )
 
 
 # Singleton instance
 _db_client: Optional[DatabaseClient] = None
+_db_client_lock = threading.Lock()
 
 
 def get_db_client() -> DatabaseClient:
@@ -806,16 +1147,23 @@ def get_db_client() -> DatabaseClient:
     """
     global _db_client
 
-    if _db_client is None:
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_ANON_KEY")
+    if _db_client is not None:
+        return _db_client
 
-        if not supabase_url or not supabase_key:
-            raise ValueError(
-                "SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment. "
-                "See FREE_TIER_SETUP.md for configuration instructions."
-            )
+    # Double-checked so concurrent first callers (e.g. from worker threads)
+    # share one client instead of each constructing their own
+    with _db_client_lock:
+        if _db_client is None:
+            supabase_url = os.getenv("SUPABASE_URL")
+            supabase_key = os.getenv("SUPABASE_ANON_KEY")
+
+            if not supabase_url or not supabase_key:
+                raise ValueError(
+                    "SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment. "
+                    "See FREE_TIER_SETUP.md for configuration instructions."
+                )
 
-        _db_client = DatabaseClient(supabase_url, supabase_key)
+            max_concurrency = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "50"))
+            _db_client = DatabaseClient(supabase_url, supabase_key, max_concurrency=max_concurrency)
 
     return _db_client
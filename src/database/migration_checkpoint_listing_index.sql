@@ -0,0 +1,13 @@
+-- Migration: Ordered index for experiment checkpoint listings
+-- Run this in Supabase SQL Editor
+
+-- list_checkpoints orders by created_at DESC. Per-job listings already use
+-- idx_checkpoints_job (job_id, created_at DESC) and transition history uses
+-- idx_transitions_job (job_id, transitioned_at); this gives per-experiment
+-- listings the same pre-sorted index. It replaces idx_checkpoints_experiment,
+-- whose (experiment_id) prefix it covers.
+CREATE INDEX IF NOT EXISTS idx_checkpoints_experiment_created
+    ON checkpoints(experiment_id, created_at DESC)
+    WHERE experiment_id IS NOT NULL;
+
+DROP INDEX IF EXISTS idx_checkpoints_experiment;
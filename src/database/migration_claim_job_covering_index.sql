@@ -0,0 +1,15 @@
+-- Migration: Covering index for the claim_job selection
+-- Run this in Supabase SQL Editor, as its own statement
+-- (CREATE INDEX CONCURRENTLY cannot run inside a transaction block)
+
+-- claim_job picks the oldest PENDING job matching the node's GPU type, price,
+-- VRAM and GPU count. Keying on created_at returns candidates already in
+-- claim order, and the INCLUDE columns let every match predicate be checked
+-- from the index, so only the job that is actually locked touches the heap.
+-- script/requirements are deliberately not included: claim_job reads the
+-- full row through UPDATE ... RETURNING, and large TEXT columns would bloat
+-- the index.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_pending_claim
+    ON jobs (created_at)
+    INCLUDE (job_id, required_gpu_type, max_price_per_hour, min_vram_gb, num_gpus)
+    WHERE status = 'PENDING';
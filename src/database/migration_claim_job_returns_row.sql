@@ -0,0 +1,48 @@
+-- Migration: claim_job returns the full claimed job row
+-- Run this in Supabase SQL Editor (after migration_security_updates.sql)
+
+-- Returning the whole row lets the marketplace hand the claimed job to the
+-- seller without a follow-up SELECT on jobs. The return type changes, so the
+-- previous definition has to be dropped first.
+DROP FUNCTION IF EXISTS claim_job(TEXT, TEXT, TEXT, FLOAT, FLOAT, INTEGER);
+
+CREATE FUNCTION claim_job(
+    p_node_id TEXT,
+    p_seller_address TEXT,
+    p_gpu_type TEXT,
+    p_price_per_hour FLOAT,
+    p_vram_gb FLOAT,
+    p_num_gpus INTEGER DEFAULT 1
+)
+RETURNS SETOF jobs AS $$
+BEGIN
+    -- Find a matching pending job
+    -- 1. Status is PENDING
+    -- 2. GPU type matches (or is null/any)
+    -- 3. Price matches (buyer's max price >= seller's price)
+    -- 4. VRAM matches (job's min vram <= seller's vram)
+    -- 5. Num GPUs matches (job's needed <= seller's available)
+    -- and claim it in the same statement, locking in the seller's price
+    RETURN QUERY
+    UPDATE jobs
+    SET status = 'CLAIMED',
+        node_id = p_node_id,
+        seller_address = p_seller_address,
+        claimed_at = NOW(),
+        locked_price_per_hour = p_price_per_hour,
+        updated_at = NOW()
+    WHERE jobs.job_id = (
+        SELECT j.job_id
+        FROM jobs j
+        WHERE j.status = 'PENDING'
+          AND (j.required_gpu_type IS NULL OR j.required_gpu_type::text = p_gpu_type)
+          AND j.max_price_per_hour >= p_price_per_hour
+          AND (j.min_vram_gb IS NULL OR j.min_vram_gb <= p_vram_gb)
+          AND (j.num_gpus <= p_num_gpus)
+        ORDER BY j.created_at ASC
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING jobs.*;
+END;
+$$ LANGUAGE plpgsql;
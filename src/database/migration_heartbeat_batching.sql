@@ -0,0 +1,27 @@
+-- Migration: Batched node heartbeats
+-- Run this in Supabase SQL Editor
+
+-- Applies many heartbeats in a single statement. The marketplace buffers
+-- heartbeats for a short interval and flushes them here instead of issuing
+-- one UPDATE per node per tick.
+-- p_p2p_urls entries may be NULL to keep the node's current P2P URL.
+CREATE OR REPLACE FUNCTION heartbeat_many(
+    p_node_ids TEXT[],
+    p_available BOOLEAN[],
+    p_p2p_urls TEXT[]
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    UPDATE compute_nodes c
+    SET last_heartbeat = NOW(),
+        is_available = t.available,
+        p2p_url = COALESCE(t.p2p_url, c.p2p_url)
+    FROM unnest(p_node_ids, p_available, p_p2p_urls) AS t(node_id, available, p2p_url)
+    WHERE c.node_id = t.node_id;
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,37 @@
+-- Migration: Set-returning functions for buyer/seller job listings
+-- Run this in Supabase SQL Editor
+
+-- Called by DatabaseClient.get_jobs_by_buyer / get_jobs_by_seller through RPC,
+-- so the listing is one fixed, parameterized query with a reusable plan
+-- instead of a PostgREST filter chain assembled per call.
+-- p_status NULL means any status.
+
+CREATE OR REPLACE FUNCTION jobs_by_buyer(
+    p_buyer TEXT,
+    p_status TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 50
+)
+RETURNS SETOF jobs
+LANGUAGE sql STABLE AS $$
+    SELECT *
+    FROM jobs
+    WHERE buyer_address = p_buyer
+      AND (p_status IS NULL OR status::text = p_status)
+    ORDER BY created_at DESC
+    LIMIT p_limit;
+$$;
+
+CREATE OR REPLACE FUNCTION jobs_by_seller(
+    p_seller TEXT,
+    p_status TEXT DEFAULT NULL,
+    p_limit INTEGER DEFAULT 50
+)
+RETURNS SETOF jobs
+LANGUAGE sql STABLE AS $$
+    SELECT *
+    FROM jobs
+    WHERE seller_address = p_seller
+      AND (p_status IS NULL OR status::text = p_status)
+    ORDER BY claimed_at DESC
+    LIMIT p_limit;
+$$;
@@ -0,0 +1,9 @@
+-- Migration: Keep large job outputs in storage
+-- Run this in Supabase SQL Editor
+
+-- Outputs over 64KB are uploaded to the job-files bucket by complete_job;
+-- result_output then only holds the first 64KB and this column points at
+-- the full output.
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS result_output_path TEXT;
+
+COMMENT ON COLUMN jobs.result_output_path IS 'Storage path of the full output when it is too large to keep inline';
@@ -0,0 +1,19 @@
+-- Migration: Single maintenance RPC
+-- Run this in Supabase SQL Editor (after schema.sql)
+
+-- Runs both periodic cleanups for the marketplace maintenance loop in one
+-- call and one transaction.
+CREATE OR REPLACE FUNCTION run_maintenance(
+    stale_minutes INTEGER DEFAULT 5,
+    timeout_multiplier DECIMAL DEFAULT 2.0
+)
+RETURNS TABLE (
+    released INTEGER,
+    failed INTEGER
+) AS $$
+BEGIN
+    RETURN QUERY SELECT
+        release_stale_claims(stale_minutes),
+        mark_stale_executions_failed(timeout_multiplier);
+END;
+$$ LANGUAGE plpgsql;
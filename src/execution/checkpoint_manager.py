@@ -3,10 +3,14 @@ Checkpoint Management
 Auto-detects and uploads training checkpoints
 """
 
+import os
 import re
+import asyncio
+import fnmatch
 import hashlib
+import shutil
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 from datetime import datetime
 import structlog
 
@@ -15,6 +19,57 @@ from src.database import get_db_client
 
 logger = structlog.get_logger()
 
+# Metadata embedded in checkpoint filenames, e.g. checkpoint_epoch3_step1200_loss0.42.pt
+_METADATA_RE = re.compile(
+    r"epoch[_-]?(?P<epoch>\d+)|step[_-]?(?P<step>\d+)|loss[_-]?(?P<loss>[0-9]+\.[0-9]+)",
+    re.IGNORECASE
+)
+_METADATA_TYPES = {"epoch": int, "step": int, "loss": float}
+
+# Directories never holding checkpoints worth uploading; skipped during scans
+_PRUNE_DIRS = frozenset({
+    ".git", "venv", ".venv", "__pycache__", "node_modules", "wandb", ".cache", "datasets"
+})
+
+# Read size for streaming checkpoints to central storage
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+# Concurrent checkpoint uploads per job, and retries for transient storage errors
+UPLOAD_WORKERS = 4
+UPLOAD_ATTEMPTS = 3
+UPLOAD_RETRY_BASE_DELAY = 1.0
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    """Apply a POSIX_FADV_* hint to a whole file; no-op where unsupported"""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy a file without routing its bytes through userspace where possible
+    
+    Uses os.copy_file_range (a reflink on filesystems that support it) and
+    falls back to shutil.copy2, which itself uses sendfile on Linux.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(src, dst)
+        return
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            _fadvise(src_fd, "POSIX_FADV_SEQUENTIAL")
+            remaining = os.fstat(src_fd).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(src_fd, dst_fd, remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        shutil.copystat(src, dst)
+    except OSError:
+        # e.g. EXDEV on older kernels or filesystems without support
+        shutil.copy2(src, dst)
+
 
 class CheckpointManager:
     """Manages checkpoint detection and upload"""
@@ -31,7 +86,18 @@ class CheckpointManager:
         "**/adapter_model.safetensors"
     ]
     
-    def __init__(self, job_id: str, workspace_path: Path, p2p_upload_dir: Optional[Path] = None):
+    # Every glob is "**/<name pattern>", so one filename regex matches them all
+    _CHECKPOINT_NAME_RE = re.compile(
+        "|".join(fnmatch.translate(g.removeprefix("**/")) for g in CHECKPOINT_GLOBS)
+    )
+    
+    def __init__(
+        self,
+        job_id: str,
+        workspace_path: Path,
+        p2p_upload_dir: Optional[Path] = None,
+        upload_workers: int = UPLOAD_WORKERS
+    ):
         """
         Initialize checkpoint manager
         
@@ -39,6 +105,7 @@ class CheckpointManager:
             job_id: Job ID
             workspace_path: Path to workspace directory
             p2p_upload_dir: Path to copy checkpoints for P2P delivery
+            upload_workers: Max checkpoints uploaded concurrently
         """
         self.job_id = job_id
         self.workspace_path = workspace_path
@@ -47,7 +114,9 @@ class CheckpointManager:
         # Lazy-loaded storage and db clients (to avoid errors when not configured)
         self._storage = None
         self._db = None
-        self.uploaded_checkpoints: set = set()  # Track uploaded files
+        # Uploaded (or in-flight) files: path -> (st_mtime_ns, st_size) when claimed
+        self.uploaded_checkpoints: Dict[str, Tuple[int, int]] = {}
+        self._upload_sem = asyncio.Semaphore(upload_workers)
     
     @property
     def storage(self):
@@ -66,37 +135,47 @@ class CheckpointManager:
         """
         Detect checkpoint files in workspace using glob patterns
         
+        Walks the workspace once with os.scandir and matches file names against
+        CHECKPOINT_GLOBS in memory. checkpoint_dir is visited first, directories
+        in _PRUNE_DIRS are skipped and symlinks are not followed. Files already
+        uploaded or uploading are skipped unless they were rewritten since.
+        
         Returns:
             List of checkpoint file paths
         """
         checkpoints = []
-        all_files = list(self.workspace_path.glob("**/*"))
-        with open("debug_scan.log", "a") as f:
-            f.write(f"\n--- SCAN for {self.job_id} ---\n")
-            f.write(f"Workspace: {self.workspace_path}\n")
-            f.write(f"Total files found: {len(all_files)}\n")
-            for fl in all_files:
-                f.write(f"  {fl}\n")
-
-        for pattern in self.CHECKPOINT_GLOBS:
-            found = list(self.workspace_path.glob(pattern))
-            if found:
-                with open("debug_scan.log", "a") as f:
-                    f.write(f"Pattern {pattern} matched: {[str(x) for x in found]}\n")
-            for file_path in found:
-                if file_path.is_file():
-                    checkpoints.append(file_path)
+        files_scanned = 0
+        checkpoint_dir = str(self.checkpoint_dir)
+        # LIFO: checkpoint_dir is popped before the workspace root
+        stack = [str(self.workspace_path), checkpoint_dir]
+        
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _PRUNE_DIRS and entry.path != checkpoint_dir:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files_scanned += 1
+                            if self._CHECKPOINT_NAME_RE.match(entry.name):
+                                claimed = self.uploaded_checkpoints.get(entry.path)
+                                if claimed is not None:
+                                    st = entry.stat(follow_symlinks=False)
+                                    if claimed == (st.st_mtime_ns, st.st_size):
+                                        continue
+                                checkpoints.append(Path(entry.path))
+            except OSError:
+                continue
         
-        # Remove duplicates and filter out already uploaded
-        unique_checkpoints = []
-        seen = set()
-        for cp in checkpoints:
-            cp_str = str(cp)
-            if cp_str not in self.uploaded_checkpoints and cp_str not in seen:
-                unique_checkpoints.append(cp)
-                seen.add(cp_str)
+        logger.debug(
+            "checkpoint_scan",
+            job_id=self.job_id,
+            files_scanned=files_scanned,
+            checkpoints_found=len(checkpoints)
+        )
         
-        return unique_checkpoints
+        return checkpoints
     
     def parse_checkpoint_metadata(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -108,39 +187,21 @@ class CheckpointManager:
         Returns:
             Dict with epoch, step, loss if found in filename
         """
-        filename = file_path.name
         metadata = {}
         
-        # Try to extract epoch
-        epoch_match = re.search(r"epoch[_-]?(\d+)", filename, re.IGNORECASE)
-        if epoch_match:
-            try:
-                metadata["epoch"] = int(epoch_match.group(1))
-            except ValueError:
-                pass
-        
-        # Try to extract step
-        step_match = re.search(r"step[_-]?(\d+)", filename, re.IGNORECASE)
-        if step_match:
-            try:
-                metadata["step"] = int(step_match.group(1))
-            except ValueError:
-                pass
-        
-        # Try to extract loss
-        loss_match = re.search(r"loss[_-]?([0-9]+\.[0-9]+)", filename, re.IGNORECASE)
-        if loss_match:
-            try:
-                metadata["loss"] = float(loss_match.group(1))
-            except ValueError:
-                pass
+        # One pass over the name; the first occurrence of each field wins
+        for match in _METADATA_RE.finditer(file_path.name):
+            key = match.lastgroup
+            if key not in metadata:
+                metadata[key] = _METADATA_TYPES[key](match.group(key))
         
         return metadata
     
     async def upload_checkpoint(self, file_path: Path) -> Optional[str]:
         """
         Upload a checkpoint file to storage and save metadata.
-        P2P copy happens first for guaranteed local delivery.
+        The P2P copy and central upload run concurrently, and the checksum
+        is computed from the upload stream.
         
         Args:
             file_path: Path to checkpoint file
@@ -148,82 +209,65 @@ class CheckpointManager:
         Returns:
             Checkpoint ID if successful, None otherwise
         """
-        checkpoint_id = None
+        transfer = await self._transfer_checkpoint(file_path)
+        if transfer is None:
+            return None
         
+        db_checkpoint_id = None
         try:
-            # Calculate file size and checksum
-            file_size = file_path.stat().st_size
-            checksum = self._calculate_checksum(file_path)
-            
-            # P2P FIRST: Copy to P2P storage area for immediate swarm delivery
-            # This is independent of central storage for local/swarm robustness
-            p2p_filename = None
-            if self.p2p_upload_dir:
-                try:
-                    import shutil
-                    self.p2p_upload_dir.mkdir(parents=True, exist_ok=True)
-                    p2p_filename = f"{self.job_id}_{file_path.name}"
-                    p2p_path = self.p2p_upload_dir / p2p_filename
-                    shutil.copy2(file_path, p2p_path)
-                    logger.info("checkpoint_prepared_for_p2p", 
-                               job_id=self.job_id, 
-                               p2p_path=str(p2p_path),
-                               filename=p2p_filename)
-                    checkpoint_id = f"p2p_{self.job_id}"
-                except Exception as e:
-                    logger.warning("p2p_checkpoint_copy_failed", job_id=self.job_id, error=str(e))
+            db_checkpoint_id = await self.db.save_checkpoint(**transfer["row"])
+        except Exception as e:
+            logger.warning("db_checkpoint_save_failed", job_id=self.job_id, error=str(e))
+        
+        return self._finish_checkpoint(file_path, transfer, db_checkpoint_id)
+    
+    async def _transfer_checkpoint(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Copy a checkpoint for P2P and upload it to central storage
+        
+        Returns:
+            Dict with the checkpoints row to save ("row"), "p2p_filename" and
+            "storage_path", or None if the file could not be processed
+        """
+        key = str(file_path)
+        
+        try:
+            st = file_path.stat()
+            file_size = st.st_size
+            # Claim the file up front so a scan during a long upload doesn't
+            # start a second one
+            self.uploaded_checkpoints[key] = (st.st_mtime_ns, st.st_size)
             
-            # Central storage (best-effort, wrapped in try-except)
-            storage_path = None
-            try:
-                storage_path = self.storage.generate_storage_path(
-                    job_id=self.job_id,
-                    file_name=file_path.name,
-                    file_type="checkpoint"
-                )
-                await self.storage.upload_file(
-                    file_path=str(file_path),
-                    storage_path=storage_path
-                )
-            except Exception as e:
-                logger.warning("central_storage_upload_failed", job_id=self.job_id, error=str(e))
-                storage_path = None
+            # P2P copy and central upload run concurrently. The central upload
+            # hashes the file as it streams it, so the checkpoint is only read
+            # once on the happy path
+            p2p_filename, (storage_path, checksum) = await asyncio.gather(
+                self._copy_for_p2p(file_path),
+                self._upload_to_storage(file_path),
+            )
+            if checksum is None:
+                checksum = await asyncio.to_thread(self._calculate_checksum, file_path)
             
             # Parse metadata from filename
             metadata = self.parse_checkpoint_metadata(file_path)
             
-            # Save checkpoint metadata to database if possible
-            try:
-                db_checkpoint_id = await self.db.save_checkpoint(
-                    job_id=self.job_id,
-                    storage_path=storage_path or f"p2p://{self.job_id}/{file_path.name}",
-                    file_size_bytes=file_size,
-                    checkpoint_name=file_path.name,
-                    epoch=metadata.get("epoch"),
-                    step=metadata.get("step"),
-                    loss=metadata.get("loss"),
-                    checksum=checksum
-                )
-                if db_checkpoint_id:
-                    checkpoint_id = db_checkpoint_id
-            except Exception as e:
-                logger.warning("db_checkpoint_save_failed", job_id=self.job_id, error=str(e))
-            
-            # Mark as uploaded (at least attempted/P2P)
-            self.uploaded_checkpoints.add(str(file_path))
-            
-            logger.info(
-                "checkpoint_processed",
-                checkpoint_id=checkpoint_id,
-                job_id=self.job_id,
-                file_name=file_path.name,
-                p2p_ready=bool(self.p2p_upload_dir and p2p_filename)
-            )
-            
-            return checkpoint_id
+            return {
+                "row": {
+                    "job_id": self.job_id,
+                    "storage_path": storage_path or f"p2p://{self.job_id}/{file_path.name}",
+                    "file_size_bytes": file_size,
+                    "checkpoint_name": file_path.name,
+                    "epoch": metadata.get("epoch"),
+                    "step": metadata.get("step"),
+                    "loss": metadata.get("loss"),
+                    "checksum": checksum
+                },
+                "p2p_filename": p2p_filename,
+                "storage_path": storage_path
+            }
             
         except Exception as e:
-
+            self.uploaded_checkpoints.pop(key, None)
             logger.error(
                 "checkpoint_upload_failed",
                 job_id=self.job_id,
@@ -232,26 +276,153 @@ class CheckpointManager:
             )
             return None
     
+    def _finish_checkpoint(
+        self,
+        file_path: Path,
+        transfer: Dict[str, Any],
+        db_checkpoint_id: Optional[str]
+    ) -> Optional[str]:
+        """Resolve the checkpoint ID for a transferred file and log the outcome"""
+        p2p_filename = transfer["p2p_filename"]
+        checkpoint_id = db_checkpoint_id or (f"p2p_{self.job_id}" if p2p_filename else None)
+        
+        # Release the claim if it landed nowhere so the next scan retries it
+        if not (checkpoint_id or transfer["storage_path"]):
+            self.uploaded_checkpoints.pop(str(file_path), None)
+        
+        logger.info(
+            "checkpoint_processed",
+            checkpoint_id=checkpoint_id,
+            job_id=self.job_id,
+            file_name=file_path.name,
+            p2p_ready=bool(self.p2p_upload_dir and p2p_filename)
+        )
+        
+        return checkpoint_id
+    
+    async def _copy_for_p2p(self, file_path: Path) -> Optional[str]:
+        """
+        Copy a checkpoint into the P2P upload area for swarm delivery.
+        Independent of central storage for local/swarm robustness.
+        
+        Returns:
+            P2P filename if copied, None otherwise
+        """
+        if not self.p2p_upload_dir:
+            return None
+        try:
+            self.p2p_upload_dir.mkdir(parents=True, exist_ok=True)
+            p2p_filename = f"{self.job_id}_{file_path.name}"
+            p2p_path = self.p2p_upload_dir / p2p_filename
+            await asyncio.to_thread(_fast_copy, file_path, p2p_path)
+            logger.info("checkpoint_prepared_for_p2p", 
+                       job_id=self.job_id, 
+                       p2p_path=str(p2p_path),
+                       filename=p2p_filename)
+            return p2p_filename
+        except Exception as e:
+            logger.warning("p2p_checkpoint_copy_failed", job_id=self.job_id, error=str(e))
+            return None
+    
+    async def _upload_to_storage(self, file_path: Path) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Stream a checkpoint to central storage (best-effort), hashing it
+        on the way out
+        
+        No Content-Length is declared: a checkpoint still being written would
+        outgrow it and fail every attempt, so the body goes out chunked.
+        
+        Returns:
+            Tuple of (storage_path, checksum), both None if the upload failed
+        """
+        try:
+            storage_path = self.storage.generate_storage_path(
+                job_id=self.job_id,
+                file_name=file_path.name,
+                file_type="checkpoint"
+            )
+        except Exception as e:
+            logger.warning("central_storage_upload_failed", job_id=self.job_id, error=str(e))
+            return None, None
+        
+        for attempt in range(UPLOAD_ATTEMPTS):
+            sha256 = hashlib.sha256()
+            try:
+                await self.storage.upload_stream(
+                    self._read_chunks(file_path, sha256),
+                    storage_path=storage_path
+                )
+                return storage_path, sha256.hexdigest()
+            except Exception as e:
+                if attempt == UPLOAD_ATTEMPTS - 1:
+                    logger.warning("central_storage_upload_failed", job_id=self.job_id, error=str(e))
+                    return None, None
+                logger.debug(
+                    "central_storage_upload_retry",
+                    job_id=self.job_id,
+                    attempt=attempt + 1,
+                    error=str(e)
+                )
+                await asyncio.sleep(UPLOAD_RETRY_BASE_DELAY * 2 ** attempt)
+    
+    @staticmethod
+    async def _read_chunks(file_path: Path, sha256) -> AsyncIterator[bytes]:
+        """Yield a file in UPLOAD_CHUNK_SIZE pieces, updating sha256 as it goes"""
+        
+        def read_chunk(f) -> bytes:
+            chunk = f.read(UPLOAD_CHUNK_SIZE)
+            sha256.update(chunk)
+            return chunk
+        
+        with open(file_path, "rb", buffering=0) as f:
+            _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+            while chunk := await asyncio.to_thread(read_chunk, f):
+                yield chunk
+            # Checkpoints aren't read again; leave the page cache to training data
+            _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+    
     def _calculate_checksum(self, file_path: Path) -> str:
         """Calculate SHA256 checksum of file"""
-        sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+        with open(file_path, "rb", buffering=0) as f:
+            _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                digest = hashlib.file_digest(f, "sha256").hexdigest()
+            else:
+                sha256 = hashlib.sha256()
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha256.update(chunk)
+                digest = sha256.hexdigest()
+            _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+            return digest
     
     async def scan_and_upload_checkpoints(self) -> List[str]:
         """
-        Scan workspace for checkpoints and upload any new ones
+        Scan workspace for checkpoints and upload any new ones,
+        up to upload_workers at a time, then save their metadata in one batch
         
         Returns:
             List of checkpoint IDs that were uploaded
         """
         checkpoints = self.detect_checkpoint_files()
-        uploaded_ids = []
         
-        for checkpoint_path in checkpoints:
-            checkpoint_id = await self.upload_checkpoint(checkpoint_path)
+        async def transfer(checkpoint_path: Path) -> Optional[Dict[str, Any]]:
+            async with self._upload_sem:
+                return await self._transfer_checkpoint(checkpoint_path)
+        
+        transfers = await asyncio.gather(*(transfer(cp) for cp in checkpoints))
+        done = [(cp, t) for cp, t in zip(checkpoints, transfers) if t is not None]
+        
+        # One insert for the whole scan instead of a round trip per checkpoint
+        db_ids: List[Optional[str]] = [None] * len(done)
+        if done:
+            try:
+                db_ids = await self.db.save_checkpoints_bulk([t["row"] for _, t in done])
+            except Exception as e:
+                logger.warning("db_checkpoint_save_failed", job_id=self.job_id, error=str(e))
+        
+        uploaded_ids = []
+        for (checkpoint_path, t), db_id in zip(done, db_ids):
+            checkpoint_id = self._finish_checkpoint(checkpoint_path, t, db_id)
             if checkpoint_id:
                 uploaded_ids.append(checkpoint_id)
         
@@ -4,6 +4,7 @@ Validates Docker images against allowed registries and security policies
 """
 
 import re
+from types import MappingProxyType
 from typing import Optional, List, Tuple
 from dataclasses import dataclass
 
@@ -51,6 +52,41 @@ class ContainerValidator:
         "rancher/rancher",
         "portainer/portainer",
     ]
+    _BLOCKED_RE = re.compile("|".join(re.escape(blocked) for blocked in BLOCKED_IMAGES))
+    
+    # Recommended pre-built images (read-only; get_recommended_images hands out copies)
+    RECOMMENDED_IMAGES = (
+        MappingProxyType({
+            "image": "jupyter/pytorch-notebook:latest",
+            "description": "JupyterLab with PyTorch (public image)",
+            "gpu": True
+        }),
+        MappingProxyType({
+            "image": "pytorch/pytorch:2.1.0-cuda12.1-cudnn8-runtime",
+            "description": "Official PyTorch with CUDA",
+            "gpu": True
+        }),
+        MappingProxyType({
+            "image": "tensorflow/tensorflow:2.14.0-gpu",
+            "description": "TensorFlow with GPU support",
+            "gpu": True
+        }),
+        MappingProxyType({
+            "image": "huggingface/transformers-pytorch-gpu:latest",
+            "description": "Hugging Face Transformers",
+            "gpu": True
+        }),
+        MappingProxyType({
+            "image": "python:3.11-slim",
+            "description": "Minimal Python environment",
+            "gpu": False
+        }),
+        MappingProxyType({
+            "image": "continuumio/anaconda3:latest",
+            "description": "Anaconda with common data science packages",
+            "gpu": False
+        })
+    )
     
     # Pattern for valid image names
     IMAGE_PATTERN = re.compile(
@@ -79,6 +115,8 @@ class ContainerValidator:
         self.allowed_registries = allowed_registries or self.DEFAULT_ALLOWED_REGISTRIES
         self.allow_latest_tag = allow_latest_tag
         self.require_digest = require_digest
+        # Registry hostnames are case-insensitive; str.startswith takes a tuple
+        self._allowed_prefixes = tuple(r.lower() for r in self.allowed_registries)
     
     def parse_image(self, image: str) -> Tuple[Optional[str], str, str]:
         """
@@ -95,11 +133,9 @@ class ContainerValidator:
         if not match:
             return None, image, "latest"
         
-        registry = match.group("registry")
-        repository = match.group("repository")
-        tag = match.group("tag") or "latest"
+        registry, repository, tag = match.group("registry", "repository", "tag")
         
-        return registry, repository, tag
+        return registry, repository, tag or "latest"
     
     def validate(self, image: str) -> ValidationResult:
         """
@@ -115,22 +151,21 @@ class ContainerValidator:
         registry, repository, tag = self.parse_image(image)
         
         # Check against blocked list
-        full_image = f"{registry}/{repository}" if registry else repository
-        for blocked in self.BLOCKED_IMAGES:
-            if blocked in image.lower():
-                logger.warning("blocked_image_rejected", image=image)
-                return ValidationResult(
-                    valid=False,
-                    image=image,
-                    registry=registry,
-                    repository=repository,
-                    tag=tag,
-                    error=f"Image is blocked for security reasons: {blocked}"
-                )
+        blocked = self._BLOCKED_RE.search(image.lower())
+        if blocked:
+            logger.warning("blocked_image_rejected", image=image)
+            return ValidationResult(
+                valid=False,
+                image=image,
+                registry=registry,
+                repository=repository,
+                tag=tag,
+                error=f"Image is blocked for security reasons: {blocked.group()}"
+            )
         
         # Check registry whitelist
         if registry:
-            if not any(registry.startswith(allowed) for allowed in self.allowed_registries):
+            if not registry.lower().startswith(self._allowed_prefixes):
                 logger.warning("registry_not_allowed", image=image, registry=registry)
                 return ValidationResult(
                     valid=False,
@@ -213,38 +248,7 @@ class ContainerValidator:
     
     def get_recommended_images(self) -> List[dict]:
         """Get list of recommended pre-built images"""
-        return [
-            {
-                "image": "jupyter/pytorch-notebook:latest",
-                "description": "JupyterLab with PyTorch (public image)",
-                "gpu": True
-            },
-            {
-                "image": "pytorch/pytorch:2.1.0-cuda12.1-cudnn8-runtime",
-                "description": "Official PyTorch with CUDA",
-                "gpu": True
-            },
-            {
-                "image": "tensorflow/tensorflow:2.14.0-gpu",
-                "description": "TensorFlow with GPU support",
-                "gpu": True
-            },
-            {
-                "image": "huggingface/transformers-pytorch-gpu:latest",
-                "description": "Hugging Face Transformers",
-                "gpu": True
-            },
-            {
-                "image": "python:3.11-slim",
-                "description": "Minimal Python environment",
-                "gpu": False
-            },
-            {
-                "image": "continuumio/anaconda3:latest",
-                "description": "Anaconda with common data science packages",
-                "gpu": False
-            }
-        ]
+        return [dict(image) for image in self.RECOMMENDED_IMAGES]
 
 
 # Default validator instance
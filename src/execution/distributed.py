@@ -4,12 +4,23 @@ Detects and configures PyTorch DDP and Horovod for multi-GPU/multi-node training
 """
 
 import os
-import re
 from typing import Optional, Dict, Any
 import structlog
 
 logger = structlog.get_logger()
 
+# Literal substrings indicating PyTorch DDP. Plain `in` checks beat a regex
+# here since none of them need regex syntax; the longer DistributedDataParallel
+# import forms all contain the bare class name.
+_DDP_NEEDLES = (
+    "DistributedDataParallel",
+    "torch.distributed.init_process_group",
+    "import torch.distributed",
+)
+
+# CUDA_VISIBLE_DEVICES values for 0..64 GPUs, indexed by GPU count
+_CUDA_CSV = tuple(",".join(map(str, range(n))) for n in range(65))
+
 
 class DistributedBackend(str):
     """Supported distributed training backends"""
@@ -27,25 +38,23 @@ def detect_distributed_backend(script: str) -> DistributedBackend:
     Returns:
         DistributedBackend enum value
     """
-    script_lower = script.lower()
-    
-    # Check for PyTorch DDP
-    ddp_patterns = [
-        r"torch\.distributed\.init_process_group",
-        r"torch\.distributed\.DistributedDataParallel",
-        r"DistributedDataParallel",
-        r"from torch\.nn\.parallel import DistributedDataParallel",
-        r"import torch\.distributed",
-    ]
-    
-    for pattern in ddp_patterns:
-        if re.search(pattern, script_lower):
-            logger.info("ddp_detected", pattern=pattern)
-            return DistributedBackend.DDP
+    needle = _find_ddp_needle(script)
+    if needle:
+        logger.info("ddp_detected", match=needle)
+        return DistributedBackend.DDP
     
     return DistributedBackend.NONE
 
 
+def _find_ddp_needle(script: str) -> Optional[str]:
+    """Return the first DDP needle found in the script, if any"""
+    # Case-sensitive: these are Python identifiers
+    for needle in _DDP_NEEDLES:
+        if needle in script:
+            return needle
+    return None
+
+
 def setup_ddp_environment(
     num_gpus: int,
     master_addr: Optional[str] = None,
@@ -84,8 +93,10 @@ def setup_ddp_environment(
     
     # Set CUDA visible devices if not already set
     if "CUDA_VISIBLE_DEVICES" not in os.environ:
-        cuda_devices = ",".join([str(i) for i in range(num_gpus)])
-        env_vars["CUDA_VISIBLE_DEVICES"] = cuda_devices
+        if 0 <= num_gpus < len(_CUDA_CSV):
+            env_vars["CUDA_VISIBLE_DEVICES"] = _CUDA_CSV[num_gpus]
+        else:
+            env_vars["CUDA_VISIBLE_DEVICES"] = ",".join(map(str, range(num_gpus)))
     
     logger.info(
         "ddp_environment_setup",
@@ -161,8 +172,5 @@ def format_docker_env_vars(env_vars: Dict[str, str]) -> list:
     Returns:
         List of ["-e", "KEY=VALUE"] pairs for Docker command
     """
-    docker_env = []
-    for key, value in env_vars.items():
-        docker_env.extend(["-e", f"{key}={value}"])
-    return docker_env
+    return [arg for key, value in env_vars.items() for arg in ("-e", f"{key}={value}")]
 
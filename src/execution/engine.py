@@ -5,19 +5,27 @@ Supports GPU passthrough for CUDA workloads
 """
 
 import asyncio
+import atexit
+import hashlib
+import json
+import math
 import shutil
 import tempfile
 import os
 import signal
+import subprocess
+import uuid
 from pathlib import Path
-from typing import Optional, Literal, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, Literal, Dict, Any, List, Set, Tuple
+from dataclasses import dataclass, replace
 from decimal import Decimal
 import time
 import threading
+import httpx
 import structlog
 
 from src.execution.proxy import WhitelistProxy
+from src.execution.cpu_affinity import CpuSetAllocator
 
 from src.execution.distributed import (
     detect_distributed_backend,
@@ -33,6 +41,111 @@ logger = structlog.get_logger()
 # GPU type for execution context
 GPUExecutionType = Literal["cuda", "mps", "cpu", "none"]
 
+# Seconds a stopped container gets between SIGTERM and SIGKILL
+CONTAINER_STOP_GRACE = 2
+
+# Seconds the local image listing is reused before re-listing; images
+# missing from it are re-checked on every call
+IMAGE_EXISTS_CACHE_TTL = 60.0
+
+DEFAULT_DOCKER_SOCKET = "/var/run/docker.sock"
+
+# Seconds a host capability probe (Docker / NVIDIA runtime available) is
+# trusted, in memory and in PROBE_CACHE_FILE under STATE_DIR
+PROBE_CACHE_TTL = 300.0
+PROBE_CACHE_FILE = "_probe.json"
+
+# Agent-private state; unlike the model cache, never mounted into containers
+STATE_DIR = Path.home() / ".local" / "state" / "computeswarm"
+
+# Phase 1 script: install the job's requirements into the shared volume
+SETUP_SCRIPT = '''#!/bin/bash
+set -e
+export PYTHONUSERBASE=/shared/.local
+export PATH="/shared/.local/bin:$PATH"
+
+echo "=== Setup Phase: Installing Requirements ==="
+if [ -f /workspace/requirements.txt ]; then
+    pip install --user -r /workspace/requirements.txt
+    echo "=== Requirements installed successfully ==="
+else
+    echo "=== No requirements.txt found, skipping installation ==="
+fi
+
+# Verify installation
+echo "=== Verifying installed packages ==="
+pip list --user | head -20
+echo "=== Setup phase complete ==="
+'''
+
+# Phase 2 script: run the job with the packages from the shared volume
+EXECUTION_SCRIPT = '''#!/bin/bash
+set -e
+export PYTHONUSERBASE=/shared/.local
+export PATH="/shared/.local/bin:$PATH"
+export PYTHONPATH="/shared/.local/lib/python3.10/site-packages:/shared/.local/lib/python3.11/site-packages:$PYTHONPATH"
+python3 /workspace/job_script.py
+'''
+
+# Single-phase jobs with requirements: best-effort install in /tmp, since
+# the container has no network
+SINGLE_PHASE_SCRIPT = '''#!/bin/bash
+set -e
+export PYTHONUSERBASE=/tmp/.local
+export PATH="/tmp/.local/bin:$PATH"
+pip install --user --no-cache-dir -q -r /workspace/requirements.txt 2>/dev/null || true
+python3 /workspace/job_script.py
+'''
+
+# Bare scripts arrive on stdin and are saved to the container's /tmp tmpfs
+# before running: executed by path, __file__ and sys.argv[0] are real,
+# which multiprocessing's spawn start method (torch DDP) needs to
+# re-import __main__ in child processes
+STDIN_SCRIPT_COMMAND = (
+    "/bin/sh", "-c", "cat > /tmp/job_script.py && exec python3 /tmp/job_script.py"
+)
+
+
+def _image_ref(image: str) -> str:
+    """
+    Normalize an image name to the repo:tag form `docker images` lists
+
+    Docker Hub images are listed by their short name, so docker.io/ and
+    library/ are dropped: docker.io/library/python:3.11 -> python:3.11
+    """
+    for prefix in ("docker.io/", "index.docker.io/"):
+        image = image.removeprefix(prefix)
+    if image.startswith("library/") and image.count("/") == 1:
+        image = image[len("library/"):]
+    return image if ":" in image.rsplit("/", 1)[-1] else f"{image}:latest"
+
+
+def _docker_socket_path() -> Optional[str]:
+    """Local Docker daemon socket, or None if the daemon isn't reachable over one"""
+    docker_host = os.environ.get("DOCKER_HOST", "")
+    if docker_host.startswith("unix://"):
+        path = docker_host[len("unix://"):]
+    elif docker_host:
+        return None  # tcp:// or ssh:// hosts are left to the docker CLI
+    else:
+        path = DEFAULT_DOCKER_SOCKET
+    return path if os.path.exists(path) else None
+
+
+SHM_DIR = Path("/dev/shm")
+
+
+def _tmpfs_workspace_dir() -> Optional[Path]:
+    """RAM-backed workspace root under /dev/shm, or None if /dev/shm isn't a tmpfs mount"""
+    try:
+        with open("/proc/mounts") as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return None
+    if any(len(m) > 2 and m[1] == str(SHM_DIR) and m[2] == "tmpfs" for m in mounts):
+        return SHM_DIR / "computeswarm"
+    return None
+
 
 @dataclass
 class ExecutionResult:
@@ -47,6 +160,44 @@ class ExecutionResult:
     metrics_collector: Optional['MetricsCollector'] = None  # For metrics collection
 
 
+@dataclass(frozen=True)
+class DockerRunSpec:
+    """
+    A docker run invocation, rendered to argv in one fixed order
+
+    base holds the prebuilt sandbox flags ("docker run --rm ..."); mounts
+    are (host path, container path, mode) and env is (name, value).
+    """
+    image: str
+    base: Tuple[str, ...]
+    command: Tuple[str, ...] = ()
+    name: Optional[str] = None
+    flags: Tuple[str, ...] = ()
+    mounts: Tuple[Tuple[str, str, str], ...] = ()
+    env: Tuple[Tuple[str, str], ...] = ()
+    workdir: Optional[str] = None
+
+    def to_argv(self) -> List[str]:
+        """Full docker command line"""
+        return [
+            *self.base,
+            *(("--name", self.name) if self.name else ()),
+            *self.flags,
+            *(arg for host, target, mode in self.mounts for arg in ("-v", f"{host}:{target}:{mode}")),
+            *(arg for key, value in self.env for arg in ("-e", f"{key}={value}")),
+            *(("-w", self.workdir) if self.workdir else ()),
+            self.image,
+            *self.command,
+        ]
+
+    def cache_key(self) -> str:
+        """
+        Stable key for containers interchangeable with this one: everything
+        except the container name and the command it runs
+        """
+        return hashlib.sha256(repr(replace(self, name=None, command=())).encode()).hexdigest()[:16]
+
+
 class JobExecutor:
     """
     Secure Python job executor with Docker sandboxing
@@ -60,8 +211,16 @@ class JobExecutor:
     - Process limits (--pids-limit)
     - Non-root user execution
     - Timeout enforcement
+
+    Jobs and docker CLI calls run as asyncio subprocesses; the seller agent
+    runs on uvloop (USE_UVLOOP) where available, which spawns them faster.
     """
 
+    # Host capability probes shared by all executors in the process:
+    # probe name -> (checked_at wall-clock time, result)
+    _probe_cache: Dict[str, Tuple[float, bool]] = {}
+    _probe_locks: Dict[str, asyncio.Lock] = {}
+
     def __init__(
         self,
         workspace_dir: Optional[Path] = None,
@@ -73,11 +232,15 @@ class JobExecutor:
         docker_cpu_limit: float = 2.0,
         docker_pids_limit: int = 100,
         docker_tmpfs_size: str = "1g",
+        docker_warm_pool_size: int = 0,
         model_cache_dir: Optional[Path] = None,
         gpu_type: GPUExecutionType = "none",
         docker_network_enabled: bool = True,
         docker_setup_timeout: int = 300,
-        p2p_upload_dir: Optional[Path] = None
+        p2p_upload_dir: Optional[Path] = None,
+        docker_cpu_pinning: bool = True,
+        tmpfs_workspace: bool = False,
+        requirements_cache_max_entries: int = 20
     ):
         """
         Initialize executor
@@ -92,10 +255,26 @@ class JobExecutor:
             docker_cpu_limit: CPU limit for containers
             docker_pids_limit: Maximum number of processes in container
             docker_tmpfs_size: Size of tmpfs mount for /tmp
+            docker_warm_pool_size: Idle sandbox containers kept running per
+                image/GPU combination for requirement-free single-phase jobs
+                (0 disables the pool)
             model_cache_dir: Directory for persistent model cache (HuggingFace, etc.)
             gpu_type: GPU type for execution ("cuda", "mps", "cpu", "none")
+            docker_cpu_pinning: Pin each job container to CPUs on one NUMA
+                node (local Docker daemon only; warm pool containers stay
+                unpinned)
+            tmpfs_workspace: Put job workspaces on /dev/shm when workspace_dir
+                isn't given (falls back to system temp if it isn't tmpfs)
+            requirements_cache_max_entries: Installed requirement sets kept per
+                execution mode (subprocess, Docker); the least recently used
+                are deleted beyond this (0 keeps all)
         """
-        self.workspace_dir = workspace_dir or Path(tempfile.gettempdir()) / "computeswarm"
+        disk_workspace_dir = Path(tempfile.gettempdir()) / "computeswarm"
+        self.workspace_dir = (
+            workspace_dir
+            or (_tmpfs_workspace_dir() if tmpfs_workspace else None)
+            or disk_workspace_dir
+        )
         self.workspace_dir.mkdir(parents=True, exist_ok=True)
         self.max_output_size = max_output_size
         self.docker_enabled = docker_enabled
@@ -105,20 +284,114 @@ class JobExecutor:
         self.docker_cpu_limit = docker_cpu_limit
         self.docker_pids_limit = docker_pids_limit
         self.docker_tmpfs_size = docker_tmpfs_size
+        self.docker_warm_pool_size = docker_warm_pool_size
+        
+        # Invariant sandbox flags, built once rather than per job. CPU limits
+        # vary per job (see _build_cpu_flags)
+        self._docker_resource_flags: Tuple[str, ...] = (
+            "--memory", docker_memory_limit,
+            "--pids-limit", str(docker_pids_limit),
+            "--tmpfs", f"/tmp:size={docker_tmpfs_size}",  # Writable /tmp
+            "--security-opt", "no-new-privileges",  # Prevent privilege escalation
+        )
+        self._docker_base_cmd: Tuple[str, ...] = (
+            "docker", "run",
+            "--rm",  # Remove container after execution
+            "--network", "none",  # No network access
+            "--read-only",  # Read-only filesystem
+            "--tmpfs", "/run:size=16m",  # Writable /run for pid/lock files
+            *self._docker_resource_flags,
+        )
+        self._docker_setup_cmd: Tuple[str, ...] = (
+            "docker", "run",
+            "--rm",
+            *self._docker_resource_flags,
+        )
         self.gpu_type = gpu_type
         
         # Model cache directory for persistent caching
         self.model_cache_dir = model_cache_dir or Path.home() / ".cache" / "computeswarm"
         self.model_cache_dir.mkdir(parents=True, exist_ok=True)
+        # Disable copy-on-write for the cache on btrfs (inherited by files
+        # created afterwards), so multi-GB weight files aren't fragmented by
+        # in-place writes. Other filesystems reject the flag; that's fine
+        if shutil.which("chattr"):
+            subprocess.run(
+                ["chattr", "+C", str(self.model_cache_dir)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+            )
+        # CUDA JIT cache, mounted read-write even where the rest of the model
+        # cache is read-only, so kernels JIT-compiled from PTX are reused by
+        # later containers instead of recompiled on first launch
+        self.cuda_cache_dir = self.model_cache_dir / "cuda"
+        self.cuda_cache_dir.mkdir(exist_ok=True)
+        # Host side of the cache bind mounts, resolved once
+        self._model_cache_host = str(self.model_cache_dir.absolute())
+        self._cuda_cache_host = str(self.cuda_cache_dir.absolute())
+        # Env pointing caches at the model cache mount (/root/.cache)
+        self._model_cache_env: Tuple[Tuple[str, str], ...] = (
+            ("HF_HOME", "/root/.cache/huggingface"),
+            ("TORCH_HOME", "/root/.cache/torch"),
+            ("TRANSFORMERS_CACHE", "/root/.cache/huggingface/transformers"),
+            ("CUDA_CACHE_PATH", "/root/.cache/cuda"),
+            ("CUDA_CACHE_MAXSIZE", "2147483647"),
+            ("CUDA_CACHE_DISABLE", "0"),
+        )
         
         # Network access configuration
         self.docker_network_enabled = docker_network_enabled
         self.docker_setup_timeout = docker_setup_timeout
         self.p2p_upload_dir = p2p_upload_dir
         
-        # Check Docker availability on init
-        self._docker_available: Optional[bool] = None
-        self._nvidia_docker_available: Optional[bool] = None
+        # repo:tag of locally present images, from one listing refreshed at
+        # most every IMAGE_EXISTS_CACHE_TTL seconds
+        self._known_images: Set[str] = set()
+        self._known_images_at = float("-inf")
+        # Docker Engine API client over the daemon socket (created lazily)
+        self._docker_api: Optional[httpx.AsyncClient] = None
+        
+        # Subprocess mode: installed requirements shared across jobs, keyed by
+        # a hash of the requirements text. Kept on disk even when workspaces
+        # are on tmpfs, since installed packages can be gigabytes.
+        cache_root = disk_workspace_dir if tmpfs_workspace and not workspace_dir else self.workspace_dir
+        self.requirements_cache_dir = cache_root / ".requirements_cache"
+        self.requirements_cache_max_entries = requirements_cache_max_entries
+        self._requirements_locks: Dict[str, asyncio.Lock] = {}
+        # Cache entry each running job uses, by workspace name; never evicted
+        self._requirements_leases: Dict[str, Path] = {}
+        
+        # Removed workspaces are renamed here and deleted in the background.
+        # Leftovers from a previous run are moved aside and deleted once.
+        self.trash_dir = self.workspace_dir / ".trash"
+        self._trash_tasks: set = set()
+        if self.trash_dir.exists():
+            stale = self.workspace_dir / f".trash.{uuid.uuid4().hex}"
+            os.replace(self.trash_dir, stale)
+            threading.Thread(
+                target=shutil.rmtree, args=(stale,), kwargs={"ignore_errors": True}, daemon=True
+            ).start()
+        
+        # CPU pinning only makes sense when containers run on this host
+        self._cpu_allocator: Optional[CpuSetAllocator] = (
+            CpuSetAllocator() if docker_cpu_pinning and _docker_socket_path() else None
+        )
+        self._job_cpusets: Dict[str, Tuple[list, Optional[int]]] = {}
+        
+        # In-flight checkpoint downloads, keyed by workspace name
+        self._checkpoint_restores: Dict[str, asyncio.Task] = {}
+        
+        # Pre-started sandbox containers, one pool of names per
+        # DockerRunSpec.cache_key(), the spec to start more from, and how
+        # many are still starting
+        self._warm_pools: Dict[str, asyncio.Queue] = {}
+        self._warm_pool_specs: Dict[str, DockerRunSpec] = {}
+        self._warm_pool_starting: Dict[str, int] = {}
+        self._warm_pool_tasks: set = set()
+        if docker_warm_pool_size:
+            atexit.register(self._kill_warm_containers_at_exit)
+        
+        # Pending fire-and-forget container stops (see _stop_container_in_background)
+        self._kill_tasks: set = set()
 
         # Start Whitelist Proxy for Setup Phase
         self.proxy_whitelist = [
@@ -149,84 +422,327 @@ class JobExecutor:
             self.proxy = None
             self.proxy_port = None
 
-    async def _check_docker_available(self) -> bool:
-        """Check if Docker is available and running"""
-        if self._docker_available is not None:
-            return self._docker_available
-            
-        try:
-            process = await asyncio.create_subprocess_exec(
-                "docker", "version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+    async def _docker_api_request(self, path: str, method: str = "GET") -> Optional[int]:
+        """
+        Call a Docker Engine API path over the daemon socket
+        
+        Much cheaper than spawning the docker CLI for simple operations.
+        
+        Returns:
+            HTTP status code, or None if the API can't be reached (callers
+            then fall back to the CLI)
+        """
+        response = await self._docker_api_call(path, method)
+        return response.status_code if response is not None else None
+
+    async def _docker_api_call(self, path: str, method: str = "GET") -> Optional[httpx.Response]:
+        """Like _docker_api_request, but return the whole response"""
+        if self._docker_api is None:
+            socket_path = _docker_socket_path()
+            if socket_path is None:
+                return None
+            self._docker_api = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=socket_path),
+                base_url="http://docker",
+                timeout=10.0
             )
-            await process.communicate()
-            self._docker_available = process.returncode == 0
+        try:
+            return await self._docker_api.request(method, path)
+        except httpx.HTTPError as e:
+            logger.debug("docker_api_request_failed", path=path, error=str(e))
+            return None
+    
+    async def close(self) -> None:
+        """Stop warm containers and release the Docker API connection pool"""
+        for task in list(self._warm_pool_tasks):
+            task.cancel()
+        for pool in self._warm_pools.values():
+            while not pool.empty():
+                await self._kill_container(pool.get_nowait())
+        if self._kill_tasks or self._trash_tasks:
+            await asyncio.gather(*self._kill_tasks, *self._trash_tasks, return_exceptions=True)
+        if self._docker_api is not None:
+            await self._docker_api.aclose()
+            self._docker_api = None
+
+    def _kill_warm_containers_at_exit(self) -> None:
+        """Kill pooled containers left behind when the process exits without close()"""
+        names = []
+        for pool in self._warm_pools.values():
+            while not pool.empty():
+                names.append(pool.get_nowait())
+        if names:
+            try:
+                subprocess.run(
+                    ["docker", "kill", *names],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False
+                )
+            except OSError:
+                pass
+
+    def _cached_probe(self, name: str) -> Optional[bool]:
+        """
+        Result of a host capability probe if checked within PROBE_CACHE_TTL,
+        by this process or (via the probe file) a previous one
+        """
+        entry = JobExecutor._probe_cache.get(name)
+        if entry is None:
+            try:
+                with open(STATE_DIR / PROBE_CACHE_FILE) as f:
+                    checked_at, result = json.load(f)[name]
+                if not isinstance(checked_at, (int, float)) or not isinstance(result, bool):
+                    return None
+            except (OSError, ValueError, KeyError, TypeError):
+                return None
+            entry = (checked_at, result)
+            JobExecutor._probe_cache[name] = entry
+        checked_at, result = entry
+        if 0 <= time.time() - checked_at < PROBE_CACHE_TTL:
+            return result
+        return None
+
+    def _store_probe(self, name: str, result: bool) -> None:
+        """
+        Record a probe result in memory and in the probe file
+
+        "Docker unavailable" is kept in memory only: persisted, it would
+        send jobs of the next agent run to the unsandboxed subprocess path
+        without probing.
+        """
+        JobExecutor._probe_cache[name] = (time.time(), result)
+        persisted = {
+            key: entry for key, entry in JobExecutor._probe_cache.items()
+            if not (key == "docker" and not entry[1])
+        }
+        try:
+            STATE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=STATE_DIR, prefix=f"{PROBE_CACHE_FILE}.")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(persisted, f)
+                os.replace(tmp_path, STATE_DIR / PROBE_CACHE_FILE)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug("probe_cache_write_failed", error=str(e))
+
+    async def _check_docker_available(self) -> bool:
+        """Check if Docker is available and running (cached, see _cached_probe)"""
+        cached = self._cached_probe("docker")
+        if cached is not None:
+            return cached
+        
+        async with JobExecutor._probe_locks.setdefault("docker", asyncio.Lock()):
+            cached = self._cached_probe("docker")
+            if cached is not None:
+                return cached
             
-            if self._docker_available:
-                logger.info("docker_available", image=self.docker_image)
-            else:
-                logger.warning("docker_not_available", message="Docker command failed")
+            try:
+                status = await self._docker_api_request("/version")
+                if status is not None:
+                    available = status == 200
+                else:
+                    process = await asyncio.create_subprocess_exec(
+                        "docker", "version",
+                        stdout=asyncio.subprocess.DEVNULL,
+                        stderr=asyncio.subprocess.DEVNULL
+                    )
+                    await process.wait()
+                    available = process.returncode == 0
                 
-        except FileNotFoundError:
-            self._docker_available = False
-            logger.warning("docker_not_found", message="Docker binary not found")
+                if available:
+                    logger.info("docker_available", image=self.docker_image)
+                else:
+                    logger.warning("docker_not_available", message="Docker command failed")
+                    
+            except FileNotFoundError:
+                available = False
+                logger.warning("docker_not_found", message="Docker binary not found")
             
-        return self._docker_available
+            self._store_probe("docker", available)
+        return available
 
     async def _check_docker_image_exists(self, image: Optional[str] = None) -> bool:
-        """Check if a Docker image exists"""
+        """
+        Check if a Docker image exists locally
+
+        Answered from the set of listed repo:tags (see _refresh_known_images)
+        rather than an inspect per image. Only presence is cached: an image
+        missing from the listing is inspected directly, so one built or
+        pulled since (e.g. by SellerAgent._check_docker_setup) is seen at
+        once. Digest references, which that listing doesn't cover, are
+        always inspected.
+        """
         image = image or self.docker_image
+        if "@" in image:
+            try:
+                return await self._inspect_image(image)
+            except Exception:
+                return False
+        
+        if time.monotonic() - self._known_images_at >= IMAGE_EXISTS_CACHE_TTL:
+            await self._refresh_known_images()
+        ref = _image_ref(image)
+        if ref in self._known_images:
+            return True
         try:
-            process = await asyncio.create_subprocess_exec(
-                "docker", "image", "inspect", image,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await process.communicate()
-            return process.returncode == 0
+            exists = await self._inspect_image(image)
         except Exception:
             return False
+        if exists:
+            self._known_images.add(ref)
+        return exists
+
+    async def _inspect_image(self, image: str) -> bool:
+        """Check a single image with GET /images/{image}/json (or docker image inspect)"""
+        status = await self._docker_api_request(f"/images/{image}/json")
+        if status is not None:
+            return status == 200
+        process = await asyncio.create_subprocess_exec(
+            "docker", "image", "inspect", image,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        await process.wait()
+        return process.returncode == 0
+
+    async def _refresh_known_images(self) -> None:
+        """Replace _known_images with one listing of local images"""
+        known: Set[str] = set()
+        try:
+            response = await self._docker_api_call("/images/json")
+            if response is not None and response.status_code == 200:
+                for entry in response.json():
+                    known.update(_image_ref(tag) for tag in entry.get("RepoTags") or ())
+            else:
+                process = await asyncio.create_subprocess_exec(
+                    "docker", "images", "--format", "{{.Repository}}:{{.Tag}}",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                stdout, _ = await process.communicate()
+                known.update(_image_ref(tag) for tag in stdout.decode().split())
+        except Exception as e:
+            logger.debug("docker_image_list_failed", error=str(e))
+        
+        self._known_images = known
+        self._known_images_at = time.monotonic()
+
+    async def _probe_docker(self, image: str) -> Tuple[bool, bool]:
+        """
+        Check Docker availability and image presence together
+
+        While availability is still unknown, a single image inspect answers
+        both: the daemon answering at all means Docker is available. Both
+        results are cached like their individual checks.
+
+        Returns:
+            Tuple of (docker available, image exists)
+        """
+        available = self._cached_probe("docker")
+        if available is not None:
+            if not available:
+                return False, False
+            return True, await self._check_docker_image_exists(image)
+        
+        try:
+            status = await self._docker_api_request(f"/images/{image}/json")
+            if status is not None:
+                available = status in (200, 404)
+                exists = status == 200
+            else:
+                process = await asyncio.create_subprocess_exec(
+                    "docker", "image", "inspect", "--format", "{{.Id}}", image,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                _, stderr = await process.communicate()
+                exists = process.returncode == 0
+                available = exists or b"Cannot connect to the Docker daemon" not in stderr
+        except FileNotFoundError:
+            self._store_probe("docker", False)
+            logger.warning("docker_not_found", message="Docker binary not found")
+            return False, False
+        
+        self._store_probe("docker", available)
+        if available:
+            logger.info("docker_available", image=self.docker_image)
+            if exists:
+                self._known_images.add(_image_ref(image))
+        else:
+            logger.warning("docker_not_available", message="Docker command failed")
+            exists = False
+        return available, exists
 
     async def _check_nvidia_docker_available(self) -> bool:
-        """Check if nvidia-docker (GPU support) is available"""
-        if self._nvidia_docker_available is not None:
-            return self._nvidia_docker_available
+        """
+        Check if nvidia-docker (GPU support) is available (cached, see _cached_probe)
+
+        Asks the NVIDIA Container Toolkit (`nvidia-container-cli info`)
+        rather than starting a CUDA container, falling back to the runtimes
+        registered with the Docker daemon when the CLI isn't on this host.
+        """
+        cached = self._cached_probe("nvidia")
+        if cached is not None:
+            return cached
         
+        async with JobExecutor._probe_locks.setdefault("nvidia", asyncio.Lock()):
+            cached = self._cached_probe("nvidia")
+            if cached is not None:
+                return cached
+            
+            try:
+                available = await self._probe_nvidia_runtime()
+            except asyncio.TimeoutError:
+                available = False
+                logger.warning("nvidia_docker_timeout", message="GPU check timed out")
+            except FileNotFoundError:
+                available = False
+                logger.warning("nvidia_docker_not_found", message="Docker not found")
+            except Exception as e:
+                available = False
+                logger.warning("nvidia_docker_check_failed", error=str(e))
+            
+            self._store_probe("nvidia", available)
+        return available
+
+    async def _probe_nvidia_runtime(self) -> bool:
+        """Run the NVIDIA runtime probes behind _check_nvidia_docker_available"""
         try:
-            # Try to run a simple GPU container
             process = await asyncio.create_subprocess_exec(
-                "docker", "run", "--rm", "--gpus", "all",
-                "nvidia/cuda:12.1.0-base-ubuntu22.04",
-                "nvidia-smi", "--query-gpu=name", "--format=csv,noheader",
+                "nvidia-container-cli", "-k", "info",
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=30
-            )
-            self._nvidia_docker_available = process.returncode == 0
-            
-            if self._nvidia_docker_available:
-                gpu_name = stdout.decode().strip().split('\n')[0]
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=10)
+            if process.returncode == 0:
+                gpu_name = next(
+                    (line.split(":", 1)[1].strip() for line in stdout.decode().splitlines()
+                     if line.strip().startswith("Model:")),
+                    None
+                )
                 logger.info("nvidia_docker_available", gpu=gpu_name)
-            else:
-                logger.warning("nvidia_docker_not_available", 
-                             message="nvidia-docker check failed",
-                             stderr=stderr.decode()[:200])
-                
-        except asyncio.TimeoutError:
-            self._nvidia_docker_available = False
-            logger.warning("nvidia_docker_timeout", message="GPU check timed out")
+                return True
+            logger.warning("nvidia_docker_not_available",
+                         message="nvidia-container-cli info failed",
+                         stderr=stderr.decode()[:200])
+            return False
         except FileNotFoundError:
-            self._nvidia_docker_available = False
-            logger.warning("nvidia_docker_not_found", message="Docker not found")
-        except Exception as e:
-            self._nvidia_docker_available = False
-            logger.warning("nvidia_docker_check_failed", error=str(e))
-            
-        return self._nvidia_docker_available
+            pass
+        
+        process = await asyncio.create_subprocess_exec(
+            "docker", "info", "--format", "{{json .Runtimes}}",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=10)
+        available = process.returncode == 0 and b"nvidia" in stdout
+        if available:
+            logger.info("nvidia_docker_available", gpu=None)
+        else:
+            logger.warning("nvidia_docker_not_available", message="No nvidia runtime registered with Docker")
+        return available
     
     def _get_effective_docker_image(self) -> str:
         """Get the appropriate Docker image based on GPU type"""
@@ -318,53 +834,33 @@ class JobExecutor:
         checkpoint_dir.mkdir(exist_ok=True)
 
         try:
-            # Download checkpoint if resuming
+            # Download checkpoint if resuming. It runs in the background while
+            # Docker is probed and requirements are installed; only running
+            # the job script waits for it (_await_checkpoint_restore)
             if resume_from_checkpoint:
-                try:
-                    from src.database import get_db_client
-                    from src.storage import get_storage_client
-                    
-                    db = get_db_client()
-                    storage = get_storage_client()
-                    
-                    checkpoint = await db.get_checkpoint(resume_from_checkpoint)
-                    if checkpoint:
-                        # Download checkpoint to workspace
-                        checkpoint_path = checkpoint_dir / Path(checkpoint["storage_path"]).name
-                        await storage.download_file(
-                            storage_path=checkpoint["storage_path"],
-                            destination_path=str(checkpoint_path)
-                        )
-                        logger.info(
-                            "checkpoint_restored",
-                            job_id=job_id,
-                            checkpoint_id=resume_from_checkpoint,
-                            checkpoint_path=str(checkpoint_path)
-                        )
-                    else:
-                        logger.warning(
-                            "checkpoint_not_found",
-                            job_id=job_id,
-                            checkpoint_id=resume_from_checkpoint
-                        )
-                except Exception as e:
-                    logger.warning(
-                        "checkpoint_restore_failed",
-                        job_id=job_id,
-                        checkpoint_id=resume_from_checkpoint,
-                        error=str(e)
-                    )
-                    # Continue execution even if checkpoint restore fails
+                self._checkpoint_restores[job_workspace.name] = asyncio.create_task(
+                    self._restore_checkpoint(job_id, resume_from_checkpoint, checkpoint_dir)
+                )
             # Determine execution mode
-            use_docker = self.docker_enabled and await self._check_docker_available()
-            
             # Select appropriate image based on GPU type
             if effective_gpu_type == "cuda":
                 docker_image = self.docker_image_gpu
             else:
                 docker_image = self.docker_image
             
-            if use_docker and not await self._check_docker_image_exists(docker_image):
+            # The Docker/image and nvidia-docker probes are independent, so
+            # run them concurrently (results are cached after the first job)
+            use_docker, image_exists, nvidia_available = False, False, False
+            if self.docker_enabled:
+                if effective_gpu_type == "cuda":
+                    (use_docker, image_exists), nvidia_available = await asyncio.gather(
+                        self._probe_docker(docker_image),
+                        self._check_nvidia_docker_available()
+                    )
+                else:
+                    use_docker, image_exists = await self._probe_docker(docker_image)
+            
+            if use_docker and not image_exists:
                 logger.warning(
                     "docker_image_not_found",
                     image=docker_image,
@@ -375,7 +871,7 @@ class JobExecutor:
             # Check nvidia-docker for GPU jobs
             use_gpu = False
             if use_docker and effective_gpu_type == "cuda":
-                if await self._check_nvidia_docker_available():
+                if nvidia_available:
                     use_gpu = True
                 else:
                     logger.warning(
@@ -403,13 +899,24 @@ class JobExecutor:
                 # Install requirements if specified (only for subprocess mode)
                 if requirements:
                     await self._install_requirements(job_workspace, requirements, timeout_seconds // 4)
+                await self._await_checkpoint_restore(job_workspace)
                 result = await self._run_script(job_workspace, script, timeout_seconds)
 
             execution_time = Decimal(str(time.time() - start_time))
             
-            # Collect metrics from output
+            # Collect metrics and detect ML frameworks from output, in a
+            # worker thread since verbose logs take a while to scan
             metrics_collector = MetricsCollector(job_id)
-            parsed_metrics = metrics_collector.parse_output(result.stdout, result.stderr)
+            
+            def scan_output() -> Tuple[List[Dict[str, Any]], bool, bool]:
+                streams = (result.stdout, result.stderr)
+                return (
+                    metrics_collector.parse_output(result.stdout, result.stderr),
+                    any(metrics_collector.detect_mlflow_usage(s) for s in streams),
+                    any(metrics_collector.detect_wandb_usage(s) for s in streams),
+                )
+            
+            parsed_metrics, uses_mlflow, uses_wandb = await asyncio.to_thread(scan_output)
             
             if parsed_metrics:
                 logger.info(
@@ -419,10 +926,9 @@ class JobExecutor:
                     metric_names=list(set(m["metric_name"] for m in parsed_metrics))
                 )
             
-            # Detect ML frameworks
-            if metrics_collector.detect_mlflow_usage(result.stdout + result.stderr):
+            if uses_mlflow:
                 logger.info("mlflow_detected_in_output", job_id=job_id)
-            if metrics_collector.detect_wandb_usage(result.stdout + result.stderr):
+            if uses_wandb:
                 logger.info("wandb_detected_in_output", job_id=job_id)
             
             # Scan and upload checkpoints
@@ -510,9 +1016,56 @@ class JobExecutor:
             )
 
         finally:
+            restore = self._checkpoint_restores.pop(job_workspace.name, None)
+            if restore is not None:
+                restore.cancel()
+            self._requirements_leases.pop(job_workspace.name, None)
             # Cleanup workspace
             await self._cleanup_workspace(job_workspace)
 
+    async def _restore_checkpoint(self, job_id: str, checkpoint_id: str, checkpoint_dir: Path) -> None:
+        """Download a checkpoint into the job's checkpoints dir (failures are logged, not raised)"""
+        try:
+            from src.database import get_db_client
+            from src.storage import get_storage_client
+
+            db = get_db_client()
+            storage = get_storage_client()
+
+            checkpoint = await db.get_checkpoint(checkpoint_id)
+            if checkpoint:
+                # Download checkpoint to workspace
+                checkpoint_path = checkpoint_dir / Path(checkpoint["storage_path"]).name
+                await storage.download_file(
+                    storage_path=checkpoint["storage_path"],
+                    destination_path=str(checkpoint_path)
+                )
+                logger.info(
+                    "checkpoint_restored",
+                    job_id=job_id,
+                    checkpoint_id=checkpoint_id,
+                    checkpoint_path=str(checkpoint_path)
+                )
+            else:
+                logger.warning(
+                    "checkpoint_not_found",
+                    job_id=job_id,
+                    checkpoint_id=checkpoint_id
+                )
+        except Exception as e:
+            logger.warning(
+                "checkpoint_restore_failed",
+                job_id=job_id,
+                checkpoint_id=checkpoint_id,
+                error=str(e)
+            )
+
+    async def _await_checkpoint_restore(self, workspace: Path) -> None:
+        """Wait for the job's background checkpoint download, if one was started"""
+        task = self._checkpoint_restores.pop(workspace.name, None)
+        if task is not None:
+            await task
+
     async def _run_in_docker(
         self,
         job_id: str,
@@ -529,9 +1082,52 @@ class JobExecutor:
         Run job with two-phase execution if network is enabled:
         - Phase 1: Setup container (network enabled) - install requirements, download models
         - Phase 2: Execution container (network disabled) - run job script
+        
+        Containers are pinned to a CPU set on one NUMA node when one is free.
         """
-        # If network is enabled and we have requirements, use two-phase execution
-        if self.docker_network_enabled and requirements:
+        cpuset = None
+        if self._cpu_allocator:
+            cpuset = self._cpu_allocator.acquire(max(1, math.ceil(self.docker_cpu_limit)))
+            if cpuset:
+                self._job_cpusets[workspace.name] = cpuset
+        try:
+            return await self._run_docker_phases(
+                job_id=job_id,
+                workspace=workspace,
+                script=script,
+                requirements=requirements,
+                timeout=timeout,
+                docker_image=docker_image,
+                use_gpu=use_gpu,
+                num_gpus=num_gpus,
+                gpu_memory_limit_per_gpu=gpu_memory_limit_per_gpu
+            )
+        finally:
+            if cpuset:
+                self._job_cpusets.pop(workspace.name, None)
+                self._cpu_allocator.release(cpuset[0])
+    
+    async def _run_docker_phases(
+        self,
+        job_id: str,
+        workspace: Path,
+        script: str,
+        requirements: Optional[str],
+        timeout: int,
+        docker_image: Optional[str] = None,
+        use_gpu: bool = False,
+        num_gpus: int = 1,
+        gpu_memory_limit_per_gpu: Optional[str] = None
+    ) -> ExecutionResult:
+        """Pick two-phase or single-phase Docker execution"""
+        # If network is enabled and we have requirements, use two-phase
+        # execution. Requirements an earlier job already installed for this
+        # image need no setup phase (and no network), so such jobs take the
+        # two-phase path straight to execution either way
+        if requirements and (
+            self.docker_network_enabled
+            or self._docker_requirements_installed(docker_image or self.docker_image, requirements)
+        ):
             return await self._run_two_phase_docker(
                 job_id=job_id,
                 workspace=workspace,
@@ -557,6 +1153,15 @@ class JobExecutor:
                 gpu_memory_limit_per_gpu=gpu_memory_limit_per_gpu
             )
     
+    def _docker_requirements_volume(self, image: str, requirements: str) -> Path:
+        """Shared volume holding requirements installed for this image"""
+        key = hashlib.sha256(f"{image}\n{requirements}".encode()).hexdigest()[:16]
+        return self.requirements_cache_dir / "docker" / key
+    
+    def _docker_requirements_installed(self, image: str, requirements: str) -> bool:
+        """Whether an earlier setup phase completed for (image, requirements)"""
+        return (self._docker_requirements_volume(image, requirements) / ".complete").exists()
+    
     async def _run_two_phase_docker(
         self,
         job_id: str,
@@ -578,35 +1183,100 @@ class JobExecutor:
         setup_container_name = f"{container_name}_setup"
         effective_image = docker_image or self.docker_image
         
-        # Write script and requirements to workspace
+        # Write script to workspace
         script_file = workspace / "job_script.py"
-        script_file.write_text(script)
-        
-        if requirements:
-            req_file = workspace / "requirements.txt"
-            req_file.write_text(requirements)
+        await asyncio.to_thread(script_file.write_text, script)
         
-        # Create shared volume directory for installed packages
-        shared_volume = workspace / "shared_volume"
-        shared_volume.mkdir(exist_ok=True)
-        packages_dir = shared_volume / ".local"
-        packages_dir.mkdir(parents=True, exist_ok=True)
+        # Installed packages are cached per (image, requirements) pair, so
+        # repeat jobs skip the setup phase and mount the cached install
+        shared_volume = self._docker_requirements_volume(effective_image, requirements)
+        key = shared_volume.name
+        complete_marker = shared_volume / ".complete"
         
-        logger.info("two_phase_execution_starting", job_id=job_id, phase="setup")
+        # One setup per key, even if several jobs arrive at once
+        installed = False
+        async with self._requirements_locks.setdefault(f"docker:{key}", asyncio.Lock()):
+            if complete_marker.exists():
+                logger.info("requirements_cache_hit", job_id=job_id, key=key)
+                complete_marker.touch()
+            else:
+                # Only the setup container reads requirements.txt
+                req_file = workspace / "requirements.txt"
+                await asyncio.to_thread(req_file.write_text, requirements)
+
+                # Start from scratch, dropping leftovers of a failed setup
+                await asyncio.to_thread(shutil.rmtree, shared_volume, ignore_errors=True)
+                (shared_volume / ".local").mkdir(parents=True)
+                
+                logger.info("two_phase_execution_starting", job_id=job_id, phase="setup")
+                
+                failure = await self._run_setup_phase(
+                    job_id=job_id,
+                    setup_container_name=setup_container_name,
+                    workspace=workspace,
+                    shared_volume=shared_volume,
+                    requirements=requirements,
+                    docker_image=effective_image,
+                    use_gpu=use_gpu,
+                    num_gpus=num_gpus,
+                    gpu_memory_limit_per_gpu=gpu_memory_limit_per_gpu
+                )
+                if failure:
+                    await asyncio.to_thread(shutil.rmtree, shared_volume, ignore_errors=True)
+                    return failure
+                complete_marker.touch()
+                installed = True
+            self._requirements_leases[workspace.name] = shared_volume
+        if installed:
+            await self._prune_requirements_cache(shared_volume.parent, "docker:")
         
         # ========================================================================
-        # PHASE 1: Setup Container (Network Enabled)
+        # PHASE 2: Execution Container (Network Disabled)
         # ========================================================================
-        setup_success = False
-        setup_error = ""
+        await self._await_checkpoint_restore(workspace)
+        logger.info("two_phase_execution_starting", job_id=job_id, phase="execution")
         
-        try:
-            setup_result = await self._run_setup_container(
-                setup_container_name=setup_container_name,
-                workspace=workspace,
+        return await self._run_execution_container(
+            container_name=container_name,
+            workspace=workspace,
+            shared_volume=shared_volume,
+            script=script,
+            timeout=timeout,
+            docker_image=effective_image,
+            use_gpu=use_gpu,
+            num_gpus=num_gpus,
+            gpu_memory_limit_per_gpu=gpu_memory_limit_per_gpu
+        )
+    
+    async def _run_setup_phase(
+        self,
+        job_id: str,
+        setup_container_name: str,
+        workspace: Path,
+        shared_volume: Path,
+        requirements: Optional[str],
+        docker_image: str,
+        use_gpu: bool,
+        num_gpus: int,
+        gpu_memory_limit_per_gpu: Optional[str]
+    ) -> Optional[ExecutionResult]:
+        """
+        Phase 1: Setup container (network enabled) installing requirements
+        into shared_volume
+
+        Returns:
+            None on success, otherwise the failed ExecutionResult for the job
+        """
+        setup_success = False
+        setup_error = ""
+        
+        try:
+            setup_result = await self._run_setup_container(
+                setup_container_name=setup_container_name,
+                workspace=workspace,
                 shared_volume=shared_volume,
                 requirements=requirements,
-                docker_image=effective_image,
+                docker_image=docker_image,
                 use_gpu=use_gpu,
                 num_gpus=num_gpus,
                 gpu_memory_limit_per_gpu=gpu_memory_limit_per_gpu
@@ -628,6 +1298,7 @@ class JobExecutor:
                 )
             
             logger.info("setup_phase_completed", job_id=job_id)
+            return None
             
         except asyncio.TimeoutError:
             logger.error("setup_phase_timeout", job_id=job_id, timeout=self.docker_setup_timeout)
@@ -653,24 +1324,7 @@ class JobExecutor:
                 stderr=str(e),
                 metrics_collector=None
             )
-        
-        # ========================================================================
-        # PHASE 2: Execution Container (Network Disabled)
-        # ========================================================================
-        logger.info("two_phase_execution_starting", job_id=job_id, phase="execution")
-        
-        return await self._run_execution_container(
-            container_name=container_name,
-            workspace=workspace,
-            shared_volume=shared_volume,
-            script=script,
-            timeout=timeout,
-            docker_image=effective_image,
-            use_gpu=use_gpu,
-            num_gpus=num_gpus,
-            gpu_memory_limit_per_gpu=gpu_memory_limit_per_gpu
-        )
-    
+
     async def _run_setup_container(
         self,
         setup_container_name: str,
@@ -685,19 +1339,12 @@ class JobExecutor:
         """
         Phase 1: Run setup container with network enabled to install requirements
         """
-        # Build base flags (renamed for clarity and reuse)
-        cmd = [
-            "docker", "run",
-            "--rm",
-            "--name", setup_container_name,
-        ]
-        
-        # Add resource limits and security options
-        cmd.extend(self._build_resource_flags())
+        flags = list(self._build_cpu_flags(workspace.name))
+        env = list(self._model_cache_env)
         
         # Add GPU flags
         if use_gpu:
-            cmd.extend(self._build_gpu_flags(num_gpus, gpu_memory_limit_per_gpu))
+            flags.extend(self._build_gpu_flags(num_gpus, gpu_memory_limit_per_gpu))
 
         # Network enabled for setup phase
         # Note: Docker doesn't support domain whitelisting natively
@@ -706,79 +1353,45 @@ class JobExecutor:
         # Configure Proxy if available
         if self.proxy and self.proxy_port:
             proxy_url = f"http://host.docker.internal:{self.proxy_port}"
-            cmd.extend([
-                "--add-host=host.docker.internal:host-gateway",
-                "-e", f"http_proxy={proxy_url}",
-                "-e", f"https_proxy={proxy_url}",
-                "-e", f"HTTP_PROXY={proxy_url}",
-                "-e", f"HTTPS_PROXY={proxy_url}",
-            ])
+            flags.append("--add-host=host.docker.internal:host-gateway")
+            env.extend((key, proxy_url) for key in ("http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY"))
             logger.debug("proxy_configured_for_setup", proxy_url=proxy_url)
 
-        # Mount model cache for downloads
-        cmd.extend([
-            "-v", f"{self.model_cache_dir.absolute()}:/root/.cache:rw",
-            "-e", "HF_HOME=/root/.cache/huggingface",
-            "-e", "TORCH_HOME=/root/.cache/torch",
-            "-e", "TRANSFORMERS_CACHE=/root/.cache/huggingface/transformers",
-        ])
-        
-        # Mount workspace and shared volume
-        cmd.extend([
-            "-v", f"{workspace.absolute()}:/workspace:ro",  # Read-only workspace
-            "-v", f"{shared_volume.absolute()}:/shared:rw",  # Writable shared volume for packages
-            "-w", "/workspace",
-            docker_image,
-        ])
-        
-        # Setup script: install requirements to shared volume
-        setup_script = f'''#!/bin/bash
-set -e
-export PYTHONUSERBASE=/shared/.local
-export PATH="/shared/.local/bin:$PATH"
-
-echo "=== Setup Phase: Installing Requirements ==="
-if [ -f /workspace/requirements.txt ]; then
-    pip install --user --no-cache-dir -r /workspace/requirements.txt
-    echo "=== Requirements installed successfully ==="
-else
-    echo "=== No requirements.txt found, skipping installation ==="
-fi
-
-# Verify installation
-echo "=== Verifying installed packages ==="
-pip list --user | head -20
-echo "=== Setup phase complete ==="
-'''
-        
-        setup_file = workspace / "setup.sh"
-        setup_file.write_text(setup_script)
-        
-        cmd.extend(["/bin/bash", "/workspace/setup.sh"])
+        # Prebuilt flags (network enabled, writable rootfs for pip) plus the
+        # per-job bits. The model cache is writable for downloads, the
+        # workspace read-only and the shared volume receives the packages.
+        # The setup script is passed inline: nothing written to the workspace
+        cmd = DockerRunSpec(
+            image=docker_image,
+            base=self._docker_setup_cmd,
+            name=setup_container_name,
+            flags=tuple(flags),
+            mounts=(
+                (self._model_cache_host, "/root/.cache", "rw"),
+                (str(workspace.absolute()), "/workspace", "ro"),
+                (str(shared_volume.absolute()), "/shared", "rw"),
+            ),
+            env=tuple(env),
+            workdir="/workspace",
+            command=("/bin/bash", "-c", SETUP_SCRIPT),
+        ).to_argv()
         
         logger.info("setup_container_starting", container_name=setup_container_name, job_id=workspace.name)
         
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=self.docker_setup_timeout
+            returncode, stdout, stderr = await self._run_bounded(
+                cmd, timeout=self.docker_setup_timeout
             )
             
             stdout_str = stdout.decode('utf-8', errors='replace')
             stderr_str = stderr.decode('utf-8', errors='replace')
             
-            success = process.returncode == 0
+            success = returncode == 0
             
             if not success:
                 logger.warning("setup_container_failed", 
                              container_name=setup_container_name,
-                             exit_code=process.returncode,
+                             exit_code=returncode,
                              stderr=stderr_str[:500])
             
             return {
@@ -791,15 +1404,7 @@ echo "=== Setup phase complete ==="
         except asyncio.TimeoutError:
             # Kill the container on timeout
             logger.warning("setup_container_timeout", container_name=setup_container_name)
-            try:
-                kill_process = await asyncio.create_subprocess_exec(
-                    "docker", "kill", setup_container_name,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                await kill_process.communicate()
-            except Exception as e:
-                logger.warning("docker_kill_failed", container_name=setup_container_name, error=str(e))
+            self._stop_container_in_background(setup_container_name)
             
             raise
     
@@ -818,33 +1423,20 @@ echo "=== Setup phase complete ==="
         """
         Phase 2: Run execution container with network disabled
         """
-        script_file = workspace / "job_script.py"
-        
-        # Build Docker command with security constraints
-        # Build Docker command with security constraints
-        cmd = [
-            "docker", "run",
-            "--rm",
-            "--name", container_name,
-            "--network", "none",  # No network access
-            "--read-only",  # Read-only filesystem
-        ]
-
-        # Add resource limits and security options
-        cmd.extend(self._build_resource_flags())
+        flags = list(self._build_cpu_flags(workspace.name))
         
         # Add GPU flags
         if use_gpu:
-            cmd.extend(self._build_gpu_flags(num_gpus, gpu_memory_limit_per_gpu))
+            flags.extend(self._build_gpu_flags(num_gpus, gpu_memory_limit_per_gpu))
             logger.info("gpu_passthrough_enabled", num_gpus=num_gpus, job_id=workspace.name,
                        gpu_memory_limit=gpu_memory_limit_per_gpu)
         
         # Detect distributed training and set up environment variables
+        # (from the script in memory; the workspace copy is for the container)
         distributed_env_vars = {}
         if use_gpu and num_gpus > 1:
-            script_content = script_file.read_text()
             distributed_env_vars = get_distributed_env_vars(
-                script=script_content,
+                script=script,
                 num_gpus=num_gpus,
                 num_nodes=1,
                 master_addr="localhost",
@@ -852,7 +1444,7 @@ echo "=== Setup phase complete ==="
             )
             
             if distributed_env_vars:
-                backend = detect_distributed_backend(script_content)
+                backend = detect_distributed_backend(script)
                 logger.info(
                     "distributed_training_detected",
                     backend=backend,
@@ -860,61 +1452,37 @@ echo "=== Setup phase complete ==="
                     job_id=workspace.name
                 )
         
-        # Mount model cache (read-only for execution)
-        cmd.extend([
-            "-v", f"{self.model_cache_dir.absolute()}:/root/.cache:ro",
-            "-e", "HF_HOME=/root/.cache/huggingface",
-            "-e", "TORCH_HOME=/root/.cache/torch",
-            "-e", "TRANSFORMERS_CACHE=/root/.cache/huggingface/transformers",
-        ])
-        
-        # Mount shared volume with installed packages (read-only)
-        cmd.extend([
-            "-v", f"{shared_volume.absolute()}:/shared:ro",
-        ])
-        
-        # Add distributed training environment variables
-        if distributed_env_vars:
-            cmd.extend(format_docker_env_vars(distributed_env_vars))
-        
-        # Mount workspace read-only and set working directory
-        cmd.extend([
-            "-v", f"{workspace.absolute()}:/workspace:ro",
-            "-w", "/workspace",
-            docker_image,
-        ])
-        
-        # Run script with packages from shared volume
-        wrapper_script = f'''#!/bin/bash
-set -e
-export PYTHONUSERBASE=/shared/.local
-export PATH="/shared/.local/bin:$PATH"
-export PYTHONPATH="/shared/.local/lib/python3.10/site-packages:/shared/.local/lib/python3.11/site-packages:$PYTHONPATH"
-python3 /workspace/job_script.py
-'''
-        wrapper_file = workspace / "run_job.sh"
-        wrapper_file.write_text(wrapper_script)
-        cmd.extend(["/bin/bash", "/workspace/run_job.sh"])
+        # Same sandbox flags as single-phase jobs. Model cache and shared
+        # volume with the installed packages are read-only (the CUDA JIT
+        # cache excepted), as is the workspace
+        spec = DockerRunSpec(
+            image=docker_image,
+            base=self._docker_base_cmd,
+            name=container_name,
+            flags=tuple(flags),
+            mounts=(
+                (self._model_cache_host, "/root/.cache", "ro"),
+                (self._cuda_cache_host, "/root/.cache/cuda", "rw"),
+                (str(shared_volume.absolute()), "/shared", "ro"),
+                (str(workspace.absolute()), "/workspace", "ro"),
+            ),
+            env=(*self._model_cache_env, *distributed_env_vars.items()),
+            workdir="/workspace",
+            # Wrapper passed inline, like the setup script
+            command=("/bin/bash", "-c", EXECUTION_SCRIPT),
+        )
+        cmd = spec.to_argv()
         
         logger.info("execution_container_starting", container_name=container_name, job_id=workspace.name,
-                   image=docker_image, gpu=use_gpu)
-        
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+                   image=docker_image, gpu=use_gpu, spec_key=spec.cache_key())
         
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
-            )
+            returncode, stdout, stderr = await self._run_bounded(cmd, timeout=timeout)
             
-            stdout_str = stdout.decode('utf-8', errors='replace')[:self.max_output_size]
-            stderr_str = stderr.decode('utf-8', errors='replace')[:self.max_output_size]
+            stdout_str = stdout.decode('utf-8', errors='replace')
+            stderr_str = stderr.decode('utf-8', errors='replace')
             
-            success = process.returncode == 0
+            success = returncode == 0
             output = stdout_str if success else ""
             error = stderr_str if not success else ""
             
@@ -922,7 +1490,7 @@ python3 /workspace/job_script.py
                 success=success,
                 output=output,
                 error=error,
-                exit_code=process.returncode or 0,
+                exit_code=returncode or 0,
                 execution_time=Decimal("0"),
                 stdout=stdout_str,
                 stderr=stderr_str,
@@ -931,15 +1499,7 @@ python3 /workspace/job_script.py
             
         except asyncio.TimeoutError:
             logger.warning("execution_container_timeout", container_name=container_name, job_id=workspace.name)
-            try:
-                kill_process = await asyncio.create_subprocess_exec(
-                    "docker", "kill", container_name,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                await kill_process.communicate()
-            except Exception as e:
-                logger.warning("docker_kill_failed", container_name=container_name, error=str(e))
+            self._stop_container_in_background(container_name)
             
             raise
     
@@ -979,59 +1539,34 @@ python3 /workspace/job_script.py
         container_name = f"computeswarm_job_{job_id.replace('-', '_')}"
         effective_image = docker_image or self.docker_image
         
+        await self._await_checkpoint_restore(workspace)
+        
+        # A bare script with nothing else to read from the workspace (no
+        # requirements, no restored checkpoint) is piped in over stdin, so
+        # the container needs no workspace bind mount
+        use_stdin = not requirements and not any(files for _, _, files in os.walk(workspace))
+        
         # Write script to workspace
-        script_file = workspace / "job_script.py"
-        script_file.write_text(script)
+        if not use_stdin:
+            script_file = workspace / "job_script.py"
+            await asyncio.to_thread(script_file.write_text, script)
         
         # Write requirements if specified
         if requirements:
             req_file = workspace / "requirements.txt"
-            req_file.write_text(requirements)
-        
-        # Build Docker command with security constraints
-        cmd = [
-            "docker", "run",
-            "--rm",  # Remove container after execution
-            "--name", container_name,
-            "--network", "none",  # No network access
-            "--read-only",  # Read-only filesystem
-            "--tmpfs", f"/tmp:size={self.docker_tmpfs_size}",  # Writable /tmp
-            "--memory", self.docker_memory_limit,
-            "--cpus", str(self.docker_cpu_limit),
-            "--pids-limit", str(self.docker_pids_limit),
-            "--security-opt", "no-new-privileges",  # Prevent privilege escalation
-        ]
+            await asyncio.to_thread(req_file.write_text, requirements)
         
         # Add GPU passthrough if requested and available
+        gpu_flags = tuple(self._build_gpu_flags(num_gpus, gpu_memory_limit_per_gpu)) if use_gpu else ()
         if use_gpu:
-            if num_gpus >= 8 or num_gpus == 0:
-                # Use all GPUs
-                if gpu_memory_limit_per_gpu:
-                    # Per-GPU memory limit not supported with "all", use device specification
-                    gpu_spec = ",".join([f"device={i}:memory={gpu_memory_limit_per_gpu}" for i in range(num_gpus)])
-                    cmd.extend(["--gpus", f'"{gpu_spec}"'])
-                else:
-                    cmd.extend(["--gpus", "all"])
-            else:
-                # Specify specific GPUs
-                if gpu_memory_limit_per_gpu:
-                    # Per-GPU memory limits
-                    gpu_spec = ",".join([f"device={i}:memory={gpu_memory_limit_per_gpu}" for i in range(num_gpus)])
-                    cmd.extend(["--gpus", f'"{gpu_spec}"'])
-                else:
-                    # Just device numbers
-                    gpu_spec = ",".join([str(i) for i in range(num_gpus)])
-                    cmd.extend(["--gpus", f'"device={gpu_spec}"'])
             logger.info("gpu_passthrough_enabled", num_gpus=num_gpus, job_id=job_id, 
                        gpu_memory_limit=gpu_memory_limit_per_gpu)
         
         # Detect distributed training and set up environment variables
         distributed_env_vars = {}
         if use_gpu and num_gpus > 1:
-            # Read script to detect distributed backend
-            script_content = script_file.read_text()
             distributed_env_vars = get_distributed_env_vars(
-                script=script_content,
+                script=script,
                 num_gpus=num_gpus,
                 num_nodes=1,  # Single-node for now, multi-node will be handled separately
                 master_addr="localhost",
@@ -1039,7 +1574,7 @@ python3 /workspace/job_script.py
             )
             
             if distributed_env_vars:
-                backend = detect_distributed_backend(script_content)
+                backend = detect_distributed_backend(script)
                 logger.info(
                     "distributed_training_detected",
                     backend=backend,
@@ -1047,59 +1582,61 @@ python3 /workspace/job_script.py
                     job_id=job_id
                 )
         
-        # Mount model cache for persistent caching (read-write for downloads)
-        # This significantly speeds up repeated runs with same models
-        cmd.extend([
-            "-v", f"{self.model_cache_dir.absolute()}:/root/.cache:rw",
-            "-e", "HF_HOME=/root/.cache/huggingface",
-            "-e", "TORCH_HOME=/root/.cache/torch",
-            "-e", "TRANSFORMERS_CACHE=/root/.cache/huggingface/transformers",
-        ])
+        # Build Docker command with security constraints
+        spec = self._single_phase_spec(effective_image, gpu_flags)
         
-        # Add distributed training environment variables
-        if distributed_env_vars:
-            cmd.extend(format_docker_env_vars(distributed_env_vars))
+        # Such scripts can also skip container startup (and, on GPU, CUDA
+        # initialization) by exec'ing into a warm container
+        if self.docker_warm_pool_size and use_stdin:
+            warm = self._take_warm_container(spec)
+            if warm:
+                return await self._run_in_warm_container(
+                    job_id, script, timeout, warm, distributed_env_vars
+                )
         
-        # Mount workspace read-only and set working directory
-        cmd.extend([
-            "-v", f"{workspace.absolute()}:/workspace:ro",
-            "-w", "/workspace",
-            effective_image,
-        ])
+        if use_stdin:
+            # Script arrives on stdin; /tmp is the only writable directory
+            spec = replace(spec, flags=("-i", *gpu_flags), command=STDIN_SCRIPT_COMMAND)
+        else:
+            # Mount workspace read-only and set working directory
+            spec = replace(
+                spec,
+                mounts=(*spec.mounts, (str(workspace.absolute()), "/workspace", "ro")),
+                workdir="/workspace",
+                command=("python3", "/workspace/job_script.py"),
+            )
         
         # If requirements specified, install them first then run script
         if requirements:
-            # Create a wrapper script that installs requirements in /tmp and runs the job
-            wrapper_script = f'''#!/bin/bash
-set -e
-export PYTHONUSERBASE=/tmp/.local
-export PATH="/tmp/.local/bin:$PATH"
-pip install --user --no-cache-dir -q -r /workspace/requirements.txt 2>/dev/null || true
-python3 /workspace/job_script.py
-'''
-            wrapper_file = workspace / "run_job.sh"
-            wrapper_file.write_text(wrapper_script)
-            cmd.extend(["/bin/bash", "/workspace/run_job.sh"])
-        else:
-            cmd.extend(["python3", "/workspace/job_script.py"])
+            spec = replace(spec, command=("/bin/bash", "-c", SINGLE_PHASE_SCRIPT))
+        
+        # Per-run bits: name, CPU limit or pinning, distributed training env
+        spec = replace(
+            spec,
+            name=container_name,
+            flags=(*self._build_cpu_flags(workspace.name), *spec.flags),
+            env=(*spec.env, *distributed_env_vars.items()),
+        )
+        cmd = spec.to_argv()
         
         logger.info("docker_container_starting", container_name=container_name, job_id=job_id,
-                   image=effective_image, gpu=use_gpu)
+                   image=effective_image, gpu=use_gpu, spec_key=spec.cache_key())
         
         process = await asyncio.create_subprocess_exec(
             *cmd,
+            stdin=asyncio.subprocess.PIPE if use_stdin else None,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE
         )
         
         try:
             stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
+                self._communicate_bounded(process, input=script.encode() if use_stdin else None),
                 timeout=timeout
             )
             
-            stdout_str = stdout.decode('utf-8', errors='replace')[:self.max_output_size]
-            stderr_str = stderr.decode('utf-8', errors='replace')[:self.max_output_size]
+            stdout_str = stdout.decode('utf-8', errors='replace')
+            stderr_str = stderr.decode('utf-8', errors='replace')
             
             success = process.returncode == 0
             output = stdout_str if success else ""
@@ -1119,17 +1656,196 @@ python3 /workspace/job_script.py
         except asyncio.TimeoutError:
             # Kill the container on timeout
             logger.warning("docker_container_timeout", container_name=container_name, job_id=job_id)
-            try:
-                kill_process = await asyncio.create_subprocess_exec(
-                    "docker", "kill", container_name,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                await kill_process.communicate()
-            except Exception as e:
-                logger.warning("docker_kill_failed", container_name=container_name, error=str(e))
+            self._stop_container_in_background(container_name)
+            
+            raise
+
+    async def _kill_container(self, container_name: str) -> None:
+        """Kill a container, logging rather than raising on failure"""
+        # 204 killed, 404 already removed, 409 not running: all done
+        if await self._docker_api_request(f"/containers/{container_name}/kill", method="POST") is not None:
+            return
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "docker", "kill", container_name,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            await process.wait()
+        except Exception as e:
+            logger.warning("docker_kill_failed", container_name=container_name, error=str(e))
+
+    async def _stop_container(self, container_name: str) -> None:
+        """
+        Stop a container gracefully: SIGTERM, then SIGKILL after
+        CONTAINER_STOP_GRACE seconds, so GPU jobs can release their CUDA
+        contexts before the next container needs the device
+        """
+        # 204 stopped, 304 already stopped, 404 already removed: all done
+        status = await self._docker_api_request(
+            f"/containers/{container_name}/stop?t={CONTAINER_STOP_GRACE}", method="POST"
+        )
+        if status is not None:
+            return
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "docker", "stop", "-t", str(CONTAINER_STOP_GRACE), container_name,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            await asyncio.wait_for(process.wait(), timeout=CONTAINER_STOP_GRACE + 1)
+            return
+        except asyncio.TimeoutError:
+            logger.warning("docker_stop_timeout", container_name=container_name)
+        except Exception as e:
+            logger.warning("docker_stop_failed", container_name=container_name, error=str(e))
+        await self._kill_container(container_name)
+
+    def _stop_container_in_background(self, container_name: str) -> None:
+        """
+        Stop a finished or timed-out container without making the caller wait
+
+        Job containers run with --rm, so Docker removes them once stopped.
+        """
+        task = asyncio.create_task(self._stop_container(container_name))
+        self._kill_tasks.add(task)
+        task.add_done_callback(self._kill_tasks.discard)
+
+    def _single_phase_spec(self, image: str, gpu_flags: Tuple[str, ...]) -> DockerRunSpec:
+        """
+        Sandbox for a single-phase job before per-run flags, i.e. what a
+        warm container for it is started from. Model cache is mounted for
+        persistent caching (read-write for downloads); this significantly
+        speeds up repeated runs with same models
+        """
+        return DockerRunSpec(
+            image=image,
+            base=self._docker_base_cmd,
+            flags=gpu_flags,
+            mounts=((self._model_cache_host, "/root/.cache", "rw"),),
+            env=self._model_cache_env,
+            workdir="/tmp",
+        )
+
+    async def start_warm_pool(self) -> None:
+        """
+        Pre-start the warm pool for the default CPU image, so the first
+        requirement-free jobs skip container startup too
+        """
+        if not (self.docker_enabled and self.docker_warm_pool_size):
+            return
+        available, exists = await self._probe_docker(self.docker_image)
+        if available and exists:
+            self._fill_warm_pool(self._single_phase_spec(self.docker_image, ()))
+
+    def _take_warm_container(self, spec: DockerRunSpec) -> Optional[str]:
+        """
+        Pop an idle container interchangeable with spec from its pool, if
+        any, and top the pool back up in the background
+        """
+        pool = self._warm_pools.get(spec.cache_key())
+        container_name = pool.get_nowait() if pool and not pool.empty() else None
+        self._fill_warm_pool(spec)
+        return container_name
+
+    def _fill_warm_pool(self, spec: DockerRunSpec) -> None:
+        """Start containers in the background until spec's pool will be full"""
+        key = spec.cache_key()
+        self._warm_pool_specs.setdefault(key, spec)
+        pool = self._warm_pools.setdefault(key, asyncio.Queue())
+        missing = self.docker_warm_pool_size - pool.qsize() - self._warm_pool_starting.get(key, 0)
+        for _ in range(max(0, missing)):
+            self._warm_pool_starting[key] = self._warm_pool_starting.get(key, 0) + 1
+            task = asyncio.create_task(self._add_warm_container(key))
+            self._warm_pool_tasks.add(task)
+            task.add_done_callback(self._warm_pool_tasks.discard)
+
+    async def _add_warm_container(self, key: str) -> None:
+        """
+        Start an idle sandbox container from the pool's spec, detached and
+        kept alive until a job execs into it
+
+        Warm containers are never CPU-pinned (they get the --cpus limit):
+        a cpuset reserved for an idle container would be unavailable to
+        running jobs for as long as it waits in the pool.
+        """
+        spec = self._warm_pool_specs[key]
+        container_name = f"computeswarm_pool_{uuid.uuid4().hex[:12]}"
+        
+        cmd = replace(
+            spec,
+            base=("docker", "run", "-d", "--init", *spec.base[2:]),
+            name=container_name,
+            flags=(*self._build_cpu_flags(container_name), *spec.flags),
+            command=("sleep", "infinity"),
+        ).to_argv()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            await process.wait()
+            if process.returncode == 0:
+                self._warm_pools[key].put_nowait(container_name)
+        except Exception as e:
+            logger.warning("warm_container_start_failed", image=spec.image, error=str(e))
+        finally:
+            self._warm_pool_starting[key] -= 1
+
+    async def _run_in_warm_container(
+        self,
+        job_id: str,
+        script: str,
+        timeout: int,
+        container_name: str,
+        env_vars: Dict[str, str]
+    ) -> ExecutionResult:
+        """
+        Run a job script via docker exec in a pre-started container
+
+        The script is piped in over stdin and saved to the container's
+        /tmp (see STDIN_SCRIPT_COMMAND). Each warm container serves
+        exactly one job and is then killed, so no state carries over
+        between jobs.
+        """
+        logger.info("warm_container_exec", container_name=container_name, job_id=job_id)
+        
+        process = await asyncio.create_subprocess_exec(
+            "docker", "exec", "-i", *format_docker_env_vars(env_vars),
+            container_name, *STDIN_SCRIPT_COMMAND,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                self._communicate_bounded(process, input=script.encode()),
+                timeout=timeout
+            )
+            
+            stdout_str = stdout.decode('utf-8', errors='replace')
+            stderr_str = stderr.decode('utf-8', errors='replace')
+            
+            success = process.returncode == 0
+            
+            return ExecutionResult(
+                success=success,
+                output=stdout_str if success else "",
+                error=stderr_str if not success else "",
+                exit_code=process.returncode or 0,
+                execution_time=Decimal("0"),  # Will be set by caller
+                stdout=stdout_str,
+                stderr=stderr_str,
+                metrics_collector=None
+            )
             
+        except asyncio.TimeoutError:
+            logger.warning("docker_container_timeout", container_name=container_name, job_id=job_id)
             raise
+        finally:
+            self._stop_container_in_background(container_name)
 
     async def _install_requirements(
         self,
@@ -1140,20 +1856,89 @@ python3 /workspace/job_script.py
         """
         Install Python requirements in isolated environment (subprocess mode only)
 
+        Each distinct requirements text is installed once into a shared
+        PYTHONUSERBASE under requirements_cache_dir; the job's .local is a
+        symlink to it, so resubmitted jobs skip pip entirely. Entries are
+        evicted least recently used first (see _prune_requirements_cache).
+
         Args:
             workspace: Job workspace directory
             requirements: Requirements string (one per line)
             timeout: Installation timeout in seconds
         """
+        key = hashlib.sha256(requirements.encode()).hexdigest()[:16]
+        user_base = self.requirements_cache_dir / key
+        complete_marker = user_base / ".complete"
+
+        # One install per requirements set, even if several jobs arrive at once
+        installed = False
+        async with self._requirements_locks.setdefault(key, asyncio.Lock()):
+            if complete_marker.exists():
+                logger.info("requirements_cache_hit", workspace=str(workspace), key=key)
+                complete_marker.touch()
+            else:
+                # Leftovers of a failed install
+                await asyncio.to_thread(shutil.rmtree, user_base, ignore_errors=True)
+                user_base.mkdir(parents=True)
+                try:
+                    await self._pip_install(workspace, requirements, user_base, timeout)
+                except BaseException:
+                    await asyncio.to_thread(shutil.rmtree, user_base, ignore_errors=True)
+                    raise
+                complete_marker.touch()
+                installed = True
+            self._requirements_leases[workspace.name] = user_base
+
+        (workspace / ".local").symlink_to(user_base, target_is_directory=True)
+        if installed:
+            await self._prune_requirements_cache(self.requirements_cache_dir, "")
+
+    async def _prune_requirements_cache(self, cache_dir: Path, lock_prefix: str) -> None:
+        """
+        Delete the least recently used installs in cache_dir beyond
+        requirements_cache_max_entries
+
+        Recency is the .complete marker's mtime, refreshed on every cache hit.
+        Entries leased by a running job are kept; each victim is removed under
+        its install lock so a job can't pick it up mid-delete.
+        """
+        if self.requirements_cache_max_entries <= 0:
+            return
+
+        def list_entries() -> List[Tuple[float, Path]]:
+            entries = []
+            for marker in cache_dir.glob("*/.complete"):
+                try:
+                    entries.append((marker.stat().st_mtime, marker.parent))
+                except OSError:
+                    continue
+            return sorted(entries, reverse=True)
+
+        entries = await asyncio.to_thread(list_entries)
+        for _, entry in entries[self.requirements_cache_max_entries:]:
+            async with self._requirements_locks.setdefault(f"{lock_prefix}{entry.name}", asyncio.Lock()):
+                if entry in self._requirements_leases.values():
+                    continue
+                await asyncio.to_thread(shutil.rmtree, entry, ignore_errors=True)
+            logger.info("requirements_cache_evicted", key=entry.name)
+
+    async def _pip_install(
+        self,
+        workspace: Path,
+        requirements: str,
+        user_base: Path,
+        timeout: int
+    ) -> None:
+        """Run pip install --user with PYTHONUSERBASE set to user_base"""
         logger.info("installing_requirements", workspace=str(workspace))
 
         # Write requirements to file
         req_file = workspace / "requirements.txt"
-        req_file.write_text(requirements)
+        await asyncio.to_thread(req_file.write_text, requirements)
 
-        # Install in user space within workspace
+        # Install in user space within the shared cache entry
         env = os.environ.copy()
-        env["PYTHONUSERBASE"] = str(workspace / ".local")
+        env["PYTHONUSERBASE"] = str(user_base)
 
         process = await asyncio.create_subprocess_exec(
             "pip", "install",
@@ -1167,14 +1952,14 @@ python3 /workspace/job_script.py
         )
 
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
+            _, stderr = await asyncio.wait_for(
+                self._communicate_bounded(process),
                 timeout=timeout
             )
 
             if process.returncode != 0:
                 raise RuntimeError(
-                    f"Failed to install requirements: {stderr.decode()[:500]}"
+                    f"Failed to install requirements: {stderr.decode(errors='replace')[:500]}"
                 )
 
             logger.info("requirements_installed", workspace=str(workspace))
@@ -1203,7 +1988,7 @@ python3 /workspace/job_script.py
         """
         # Write script to file
         script_file = workspace / "job_script.py"
-        script_file.write_text(script)
+        await asyncio.to_thread(script_file.write_text, script)
 
         # Set up environment with local packages
         env = os.environ.copy()
@@ -1225,12 +2010,12 @@ python3 /workspace/job_script.py
 
         try:
             stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
+                self._communicate_bounded(process),
                 timeout=timeout
             )
 
-            stdout_str = stdout.decode('utf-8', errors='replace')[:self.max_output_size]
-            stderr_str = stderr.decode('utf-8', errors='replace')[:self.max_output_size]
+            stdout_str = stdout.decode('utf-8', errors='replace')
+            stderr_str = stderr.decode('utf-8', errors='replace')
 
             success = process.returncode == 0
             output = stdout_str if success else ""
@@ -1257,18 +2042,96 @@ python3 /workspace/job_script.py
             await process.wait()
             raise
 
+    async def _communicate_bounded(
+        self,
+        process: asyncio.subprocess.Process,
+        input: Optional[bytes] = None
+    ) -> Tuple[bytes, bytes]:
+        """
+        Like process.communicate(), but keep at most max_output_size bytes of
+        each stream, discarding the rest as it arrives so a runaway job can't
+        exhaust memory
+        """
+        limit = self.max_output_size
+
+        async def feed() -> None:
+            if input is None:
+                return
+            try:
+                process.stdin.write(input)
+                await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # exited without reading all of it; its output says why
+            finally:
+                process.stdin.close()
+
+        async def drain(stream: asyncio.StreamReader) -> bytes:
+            buf = bytearray()
+            while chunk := await stream.read(65536):
+                if len(buf) < limit:
+                    buf += chunk[:limit - len(buf)]
+            return bytes(buf)
+
+        stdout, stderr, _, _ = await asyncio.gather(
+            drain(process.stdout),
+            drain(process.stderr),
+            feed(),
+            process.wait()
+        )
+        return stdout, stderr
+
+    async def _run_bounded(self, cmd: List[str], timeout: float) -> Tuple[int, bytes, bytes]:
+        """
+        Run a command keeping at most max_output_size bytes of each output
+        stream (see _communicate_bounded), so a job printing in a loop
+        can't fill memory or disk before its timeout
+
+        Returns:
+            Tuple of (exit code, stdout, stderr)
+
+        Raises:
+            asyncio.TimeoutError: If the command doesn't finish within
+                timeout; it is killed and reaped first
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(self._communicate_bounded(process), timeout=timeout)
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+        return process.returncode, stdout, stderr
+
     async def _cleanup_workspace(self, workspace: Path) -> None:
         """
         Clean up job workspace
 
+        The directory is renamed into the trash dir (O(1)) and deleted in
+        a background thread, so job completion doesn't wait on large
+        workspaces such as ones holding pip's .local.
+
         Args:
             workspace: Directory to clean up
         """
         try:
-            shutil.rmtree(workspace, ignore_errors=True)
-            logger.info("workspace_cleaned", workspace=str(workspace))
-        except Exception as e:
-            logger.warning("workspace_cleanup_failed", workspace=str(workspace), error=str(e))
+            trash = self.trash_dir / f"{workspace.name}.{uuid.uuid4().hex}"
+            self.trash_dir.mkdir(exist_ok=True)
+            os.replace(workspace, trash)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning("workspace_trash_failed", workspace=str(workspace), error=str(e))
+            trash = workspace
+        
+        task = asyncio.create_task(asyncio.to_thread(shutil.rmtree, trash, ignore_errors=True))
+        self._trash_tasks.add(task)
+        task.add_done_callback(self._trash_tasks.discard)
+        logger.info("workspace_cleaned", workspace=str(workspace))
 
     def get_workspace_size(self, job_id: str) -> int:
         """
@@ -1284,26 +2147,48 @@ python3 /workspace/job_script.py
         if not workspace.exists():
             return 0
 
+        # os.scandir reuses the directory listing for the type check, so the
+        # only per-file syscall is the lstat for the size
         total = 0
-        for dirpath, dirnames, filenames in os.walk(workspace):
-            for filename in filenames:
-                filepath = Path(dirpath) / filename
-                total += filepath.stat().st_size
+        stack = [str(workspace)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
 
         return total
 
-    def _build_resource_flags(self) -> list[str]:
-        """Build common resource limit flags"""
-        return [
-            "--memory", self.docker_memory_limit,
-            "--cpus", str(self.docker_cpu_limit),
-            "--pids-limit", str(self.docker_pids_limit),
-            "--tmpfs", f"/tmp:size={self.docker_tmpfs_size}",
-            "--security-opt", "no-new-privileges",
-        ]
+    def _build_cpu_flags(self, job_id: str) -> list[str]:
+        """
+        Build CPU limit flags for a job
+
+        A job pinned to a CPU set gets --cpuset-cpus/--cpuset-mems alone:
+        exclusive cores need no CFS quota, which would otherwise throttle
+        threads at period boundaries. Unpinned jobs fall back to --cpus.
+        """
+        cpuset = self._job_cpusets.get(job_id)
+        if not cpuset:
+            return ["--cpus", str(self.docker_cpu_limit)]
+        cpus, node = cpuset
+        flags = ["--cpuset-cpus", ",".join(map(str, cpus))]
+        if node is not None:
+            flags.extend(["--cpuset-mems", str(node)])
+        return flags
 
     def _build_gpu_flags(self, num_gpus: int, gpu_memory_limit_per_gpu: Optional[str]) -> list[str]:
-        """Build GPU flags for proper passthrough"""
+        """
+        Build GPU flags for proper passthrough
+
+        Docker reads the --gpus value as CSV, so a device list must keep
+        its surrounding double quotes even without a shell: unquoted,
+        "device=0,1" would split into "device=0" and a stray "1".
+        """
         flags = []
         if num_gpus >= 8 or num_gpus == 0:
             if gpu_memory_limit_per_gpu:
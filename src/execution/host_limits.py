@@ -0,0 +1,111 @@
+"""
+Host Resource Limits
+Reads this process's cgroup budget to size sandbox container limits
+"""
+
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+import structlog
+
+logger = structlog.get_logger()
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def _own_cgroup_dir() -> Path:
+    """cgroup v2 directory of this process (the root if it can't be determined)"""
+    try:
+        for line in Path("/proc/self/cgroup").read_text().splitlines():
+            if line.startswith("0::"):
+                return CGROUP_ROOT / line[3:].lstrip("/")
+    except OSError:
+        pass
+    return CGROUP_ROOT
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def read_cgroup_cpu_limit() -> Optional[float]:
+    """
+    CPUs this process may use per its cgroup quota
+
+    Returns:
+        quota / period, or None when unlimited or no cgroup info is available
+    """
+    # cgroup v2: "<quota|max> <period>"
+    cpu_max = _read(_own_cgroup_dir() / "cpu.max") or _read(CGROUP_ROOT / "cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+
+    # cgroup v1
+    quota = _read(CGROUP_ROOT / "cpu" / "cpu.cfs_quota_us")
+    period = _read(CGROUP_ROOT / "cpu" / "cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def read_cgroup_memory_limit() -> Optional[int]:
+    """
+    Memory limit in bytes from this process's cgroup
+
+    Returns:
+        Limit in bytes, or None when unlimited or no cgroup info is available
+    """
+    limit = _read(_own_cgroup_dir() / "memory.max") or _read(CGROUP_ROOT / "memory.max")
+    if limit is None:
+        limit = _read(CGROUP_ROOT / "memory" / "memory.limit_in_bytes")  # cgroup v1
+    if limit is None or limit == "max":
+        return None
+    # v1 reports "unlimited" as a huge page-aligned number
+    value = int(limit)
+    return value if value < 2 ** 62 else None
+
+
+def auto_container_limits(
+    concurrent_jobs: int = 1,
+    cpu_fraction: float = 0.9,
+    memory_fraction: float = 0.8
+) -> Tuple[float, str]:
+    """
+    Per-container CPU and memory limits from the host's effective budget
+
+    The budget is the cgroup limit, capped by the CPUs this process may run
+    on and by physical memory, with a fraction held back for the agent and
+    Docker daemon, then split evenly between concurrent jobs.
+
+    Returns:
+        Tuple of (cpu limit for --cpus, memory limit for --memory)
+    """
+    cpus = float(len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1)
+    cgroup_cpus = read_cgroup_cpu_limit()
+    if cgroup_cpus is not None:
+        cpus = min(cpus, cgroup_cpus)
+
+    memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    cgroup_memory = read_cgroup_memory_limit()
+    if cgroup_memory is not None:
+        memory = min(memory, cgroup_memory)
+
+    concurrent_jobs = max(1, concurrent_jobs)
+    cpu_limit = round(max(1.0, cpus * cpu_fraction / concurrent_jobs), 2)
+    memory_mb = max(256, int(memory * memory_fraction / concurrent_jobs) // (1024 * 1024))
+
+    logger.info(
+        "container_limits_computed",
+        host_cpus=cpus,
+        host_memory_mb=memory // (1024 * 1024),
+        concurrent_jobs=concurrent_jobs,
+        cpu_limit=cpu_limit,
+        memory_limit_mb=memory_mb
+    )
+    return cpu_limit, f"{memory_mb}m"
@@ -11,6 +11,11 @@ import structlog
 
 logger = structlog.get_logger()
 
+_STEP_RE = re.compile(r"step[:\s]+([0-9]+)", re.IGNORECASE)
+_EPOCH_RE = re.compile(r"epoch[:\s]+([0-9]+)", re.IGNORECASE)
+_MLFLOW_RE = re.compile(r"mlflow\.log_metric|mlflow\.log_param|MLflow", re.IGNORECASE)
+_WANDB_RE = re.compile(r"wandb\.log|wandb\.init|Weights & Biases|W&B", re.IGNORECASE)
+
 
 class MetricsCollector:
     """Collects and parses training metrics from job output"""
@@ -51,6 +56,17 @@ class MetricsCollector:
         ],
     }
     
+    # Compiled once: per-metric patterns (tried in order) and their union,
+    # which lets parse_output skip lines that match none of them
+    _COMPILED_PATTERNS = {
+        name: [re.compile(p, re.IGNORECASE) for p in patterns]
+        for name, patterns in METRIC_PATTERNS.items()
+    }
+    _ANY_METRIC_RE = re.compile(
+        "|".join(p for patterns in METRIC_PATTERNS.values() for p in patterns),
+        re.IGNORECASE
+    )
+    
     def __init__(self, job_id: str):
         """
         Initialize metrics collector for a job
@@ -72,36 +88,36 @@ class MetricsCollector:
         Returns:
             List of metric dicts with name, value, timestamp, step
         """
-        combined_output = output
+        # Same line numbering as parsing output + "\n" + stderr, without
+        # building the combined string
+        lines = output.split("\n")
         if stderr:
-            combined_output += "\n" + stderr
+            lines.extend(stderr.split("\n"))
         
         parsed_metrics = []
-        lines = combined_output.split("\n")
         
         for line_num, line in enumerate(lines):
+            if not self._ANY_METRIC_RE.search(line):
+                continue
+            
+            # Step/epoch from the same line, looked up once per line
+            step = None
+            epoch = None
+            step_match = _STEP_RE.search(line)
+            if step_match:
+                step = int(step_match.group(1))
+            epoch_match = _EPOCH_RE.search(line)
+            if epoch_match:
+                epoch = int(epoch_match.group(1))
+            
             # Try to extract metrics from this line
-            for metric_name, patterns in self.METRIC_PATTERNS.items():
+            for metric_name, patterns in self._COMPILED_PATTERNS.items():
                 for pattern in patterns:
-                    match = re.search(pattern, line, re.IGNORECASE)
+                    match = pattern.search(line)
                     if match:
                         try:
                             value = float(match.group(1))
                             
-                            # Try to extract step/epoch from the same line or nearby
-                            step = None
-                            epoch = None
-                            
-                            # Look for step in the same line
-                            step_match = re.search(r"step[:\s]+([0-9]+)", line, re.IGNORECASE)
-                            if step_match:
-                                step = int(step_match.group(1))
-                            
-                            # Look for epoch in the same line
-                            epoch_match = re.search(r"epoch[:\s]+([0-9]+)", line, re.IGNORECASE)
-                            if epoch_match:
-                                epoch = int(epoch_match.group(1))
-                            
                             metric = {
                                 "job_id": self.job_id,
                                 "metric_name": metric_name,
@@ -137,16 +153,9 @@ class MetricsCollector:
         Returns:
             True if MLflow detected
         """
-        mlflow_patterns = [
-            r"mlflow\.log_metric",
-            r"mlflow\.log_param",
-            r"MLflow",
-        ]
-        
-        for pattern in mlflow_patterns:
-            if re.search(pattern, output, re.IGNORECASE):
-                logger.info("mlflow_detected", job_id=self.job_id)
-                return True
+        if _MLFLOW_RE.search(output):
+            logger.info("mlflow_detected", job_id=self.job_id)
+            return True
         
         return False
     
@@ -160,17 +169,9 @@ class MetricsCollector:
         Returns:
             True if W&B detected
         """
-        wandb_patterns = [
-            r"wandb\.log",
-            r"wandb\.init",
-            r"Weights & Biases",
-            r"W&B",
-        ]
-        
-        for pattern in wandb_patterns:
-            if re.search(pattern, output, re.IGNORECASE):
-                logger.info("wandb_detected", job_id=self.job_id)
-                return True
+        if _WANDB_RE.search(output):
+            logger.info("wandb_detected", job_id=self.job_id)
+            return True
         
         return False
     
@@ -222,7 +222,7 @@ class ModelManager:
             format_ext = file_path.suffix.lstrip(".")
             
             # Upload file (use chunked upload for large files)
-            if file_size > 100 * 1024 * 1024:  # > 100MB
+            if file_size > self.storage.multipart_threshold:
                 await self.storage.upload_chunked(
                     file_path=str(file_path),
                     storage_path=storage_path
@@ -242,7 +242,7 @@ class ModelManager:
                 storage_path=storage_path,
                 file_size_bytes=file_size,
                 checksum=checksum,
-                format=format_ext,
+                model_format=format_ext,
                 framework=framework
             )
             
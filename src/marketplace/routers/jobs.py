@@ -34,18 +34,11 @@ async def estimate_job_cost(
     
     nodes = await db.get_active_nodes(
         gpu_type=gpu_type_enum,
-        max_price=max_price_decimal
+        max_price=max_price_decimal,
+        min_vram=Decimal(str(min_vram_gb)) if min_vram_gb else None,
+        min_num_gpus=num_gpus
     )
     
-    # Filter by VRAM if specified
-    if min_vram_gb:
-        min_vram = Decimal(str(min_vram_gb))
-        nodes = [n for n in nodes if n.get("vram_gb", 0) and Decimal(str(n["vram_gb"])) >= min_vram]
-    
-    # Filter by num_gpus if specified
-    if num_gpus > 1:
-        nodes = [n for n in nodes if n.get("num_gpus", 1) >= num_gpus]
-    
     if not nodes:
         return {
             "estimated": False,
@@ -435,6 +428,39 @@ async def get_job_status(request: Request, job_id: str):
     return job
 
 
+@router.get("/{job_id}/output")
+@limiter.limit("30/minute")
+async def get_job_output(request: Request, job_id: str):
+    """
+    Get a job's full output
+    Large outputs are kept in storage and returned as a signed download URL
+    """
+    db = get_db_client()
+
+    job = await db.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+
+    storage_path = job.get("result_output_path")
+    if not storage_path:
+        return {"job_id": job_id, "output": job.get("result_output"), "download_url": None}
+
+    from src.storage import get_storage_client
+
+    storage = get_storage_client()
+    download_url = storage.get_signed_download_url(storage_path, expires_in_seconds=3600)
+
+    return {
+        "job_id": job_id,
+        "output": None,
+        "download_url": download_url,
+        "expires_in": 3600
+    }
+
+
 @router.get("/buyer/{buyer_address}")
 @limiter.limit("100/minute")
 async def list_buyer_jobs(
@@ -481,15 +507,29 @@ async def list_seller_jobs(
 
 @router.get("/queue/pending")
 @limiter.limit("100/minute")
-async def get_pending_jobs(request: Request, gpu_type: Optional[str] = None, limit: int = 100):
+async def get_pending_jobs(
+    request: Request,
+    gpu_type: Optional[str] = None,
+    limit: int = 100,
+    price_per_hour: Optional[float] = None,
+    vram_gb: Optional[float] = None,
+    num_gpus: Optional[int] = None
+):
     """
     Get pending jobs in queue (for monitoring/debugging)
+    Optionally restricted to jobs a node with the given price/VRAM/GPU count could claim
     """
     db = get_db_client()
 
     gpu_type_enum = GPUType(gpu_type) if gpu_type else None
 
-    jobs = await db.get_pending_jobs(gpu_type=gpu_type_enum, limit=limit)
+    jobs = await db.get_pending_jobs(
+        gpu_type=gpu_type_enum,
+        limit=limit,
+        price_per_hour=Decimal(str(price_per_hour)) if price_per_hour is not None else None,
+        vram_gb=Decimal(str(vram_gb)) if vram_gb is not None else None,
+        num_gpus=num_gpus
+    )
 
     return {"jobs": jobs, "count": len(jobs)}
 
@@ -126,8 +126,7 @@ async def node_heartbeat(node_id: str, available: bool = True, p2p_url: Optional
     db = get_db_client()
 
     try:
-        await db.update_node_heartbeat(node_id, p2p_url=p2p_url)
-        await db.set_node_availability(node_id, available)
+        await db.update_node_heartbeat(node_id, p2p_url=p2p_url, available=available)
 
         logger.debug("heartbeat_received", node_id=node_id, available=available)
 
@@ -61,6 +61,10 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    # Write out heartbeats still buffered for the next batch
+    if db is not None:
+        await db.flush_heartbeats()
+
     logger.info("marketplace_shutting_down")
 
 
@@ -105,11 +109,12 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 config = get_marketplace_config()
 # Default frontend origins for development
 default_origins = ["http://localhost:3000", "http://localhost:5173", "http://127.0.0.1:3000", "http://127.0.0.1:5173"]
-cors_origins = config.cors_origins if config.cors_origins else default_origins
+cors_origins = list(config.cors_origins) if config.cors_origins else default_origins
+cors_origins_set = config.cors_origins_set if config.cors_origins else frozenset(default_origins)
 
 # Add frontend URL from environment if provided
 frontend_url = os.getenv("FRONTEND_URL")
-if frontend_url and frontend_url not in cors_origins:
+if frontend_url and frontend_url not in cors_origins_set:
     cors_origins.append(frontend_url)
 
 logger.info("cors_origins_configured", origins=cors_origins)
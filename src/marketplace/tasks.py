@@ -13,22 +13,16 @@ async def run_maintenance_tasks():
         try:
             await asyncio.sleep(60)  # Run every minute
 
-            # Release stale claims (claimed but not started in 5 minutes)
-            # Use try-except separately so one failure doesn't block the other
+            # Release stale claims (claimed but not started in 5 minutes) and
+            # mark stale executions as failed (executing > 2x timeout) in one RPC
             try:
-                released = await db.release_stale_claims(stale_minutes=5)
+                released, failed = await db.run_maintenance(stale_minutes=5, timeout_multiplier=2.0)
                 if released > 0:
                     logger.info("stale_claims_released", count=released)
-            except Exception as e:
-                logger.error("stale_claims_release_error", error=str(e))
-
-            # Mark stale executions as failed (executing > 2x timeout)
-            try:
-                failed = await db.mark_stale_executions_failed(timeout_multiplier=2.0)
                 if failed > 0:
                     logger.warning("stale_executions_marked_failed", count=failed)
             except Exception as e:
-                logger.error("stale_executions_check_error", error=str(e))
+                logger.error("maintenance_rpc_error", error=str(e))
 
         except asyncio.CancelledError:
             logger.info("maintenance_tasks_stopped")
@@ -24,6 +24,7 @@ from src.execution.gpu_detector import GPUDetector
 from src.marketplace.models import NodeRegistration, GPUType
 from src.config import get_seller_config
 from src.execution import JobExecutor
+from src.execution.host_limits import auto_container_limits
 from src.payments import PaymentProcessor, calculate_job_cost, calculate_estimated_cost
 from src.networking.tunnel import TunnelManager
 from src.storage.transfer import start_file_server_background
@@ -283,24 +284,34 @@ class SellerAgent:
 
         model_cache_path = Path(self.config.model_cache_dir).expanduser()
         
+        docker_cpu_limit = self.config.docker_cpu_limit
+        docker_memory_limit = self.config.docker_memory_limit
+        if self.config.docker_auto_limits:
+            docker_cpu_limit, docker_memory_limit = auto_container_limits(self.config.max_concurrent_jobs)
+        
         self.executor = JobExecutor(
             docker_enabled=self.config.docker_enabled,
             docker_image=self.config.docker_image,
             docker_image_gpu=self.config.docker_image_gpu,
-            docker_memory_limit=self.config.docker_memory_limit,
-            docker_cpu_limit=self.config.docker_cpu_limit,
+            docker_memory_limit=docker_memory_limit,
+            docker_cpu_limit=docker_cpu_limit,
             docker_pids_limit=self.config.docker_pids_limit,
             docker_tmpfs_size=self.config.docker_tmpfs_size,
+            docker_warm_pool_size=self.config.docker_warm_pool_size,
+            docker_cpu_pinning=self.config.docker_cpu_pinning,
             model_cache_dir=model_cache_path if self.config.model_cache_enabled else None,
             gpu_type=self.gpu_info.gpu_type.value,
             docker_network_enabled=self.config.docker_network_enabled,
             docker_setup_timeout=self.config.docker_setup_timeout,
-            p2p_upload_dir=self.p2p_storage_dir
+            p2p_upload_dir=self.p2p_storage_dir,
+            tmpfs_workspace=self.config.tmpfs_workspace,
+            requirements_cache_max_entries=self.config.requirements_cache_max_entries
         )
         
         # logger.info("executor_initialized")
 
         await self._check_docker_setup()
+        await self.executor.start_warm_pool()
         
         # Start P2P Services
         logger.info("starting_p2p_services", storage_dir=str(self.p2p_storage_dir))
@@ -600,6 +611,8 @@ class SellerAgent:
                 await self.client.post(f"{self.config.marketplace_url}/api/v1/nodes/{self.node_id}/unavailable")
             except:
                 pass
+        if self.executor:
+            await self.executor.close()
         await self.client.aclose()
 
 
@@ -645,4 +658,10 @@ async def main():
         await server_task
 
 if __name__ == "__main__":
+    if get_seller_config().use_uvloop:
+        try:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        except ImportError:
+            pass
     asyncio.run(main())
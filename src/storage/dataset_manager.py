@@ -96,7 +96,7 @@ class DatasetManager:
         
         # Upload file (use chunked upload for large files)
         file_size = Path(file_path).stat().st_size
-        if file_size > 100 * 1024 * 1024:  # > 100MB
+        if file_size > self.storage.multipart_threshold:
             upload_result = await self.storage.upload_chunked(
                 file_path=file_path,
                 storage_path=storage_path
@@ -5,9 +5,10 @@ Provides pre-signed URLs for secure direct uploads
 
 import os
 import uuid
+import asyncio
 import hashlib
 from datetime import datetime, timedelta
-from typing import Optional, BinaryIO, Dict, Any
+from typing import Optional, BinaryIO, Dict, Any, AsyncIterator
 from pathlib import Path
 
 import httpx
@@ -34,7 +35,8 @@ class StorageClient:
         self,
         supabase_url: str,
         supabase_key: str,
-        bucket_name: str = "job-files"
+        bucket_name: str = "job-files",
+        multipart_threshold: int = 100 * 1024 * 1024
     ):
         """
         Initialize Supabase Storage client
@@ -43,15 +45,32 @@ class StorageClient:
             supabase_url: Supabase project URL
             supabase_key: Supabase anon/service key
             bucket_name: Storage bucket name
+            multipart_threshold: Size in bytes above which callers should use upload_chunked
         """
         self.client: Client = create_client(supabase_url, supabase_key)
         self.bucket_name = bucket_name
         self.supabase_url = supabase_url
         self.supabase_key = supabase_key
+        self.multipart_threshold = multipart_threshold
         
         # Ensure bucket exists (would need service role key)
         self._ensure_bucket_exists()
     
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking supabase-py storage call in a worker thread"""
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    
+    @staticmethod
+    def _read_file(file_path: str) -> bytes:
+        with open(file_path, "rb") as f:
+            return f.read()
+    
+    @staticmethod
+    def _write_file(destination_path: str, data: bytes) -> None:
+        Path(destination_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(destination_path, "wb") as f:
+            f.write(data)
+    
     def _ensure_bucket_exists(self) -> None:
         """Ensure the storage bucket exists"""
         try:
@@ -120,14 +139,14 @@ class StorageClient:
             Dict with upload result including path and size
         """
         try:
-            with open(file_path, "rb") as f:
-                file_data = f.read()
+            file_data = await self._run(self._read_file, file_path)
             
             file_size = len(file_data)
             checksum = hashlib.sha256(file_data).hexdigest()
             
             # Upload to Supabase Storage
-            result = self.client.storage.from_(self.bucket_name).upload(
+            result = await self._run(
+                self.client.storage.from_(self.bucket_name).upload,
                 path=storage_path,
                 file=file_data,
                 file_options={
@@ -174,7 +193,8 @@ class StorageClient:
             file_size = len(data)
             checksum = hashlib.sha256(data).hexdigest()
             
-            result = self.client.storage.from_(self.bucket_name).upload(
+            result = await self._run(
+                self.client.storage.from_(self.bucket_name).upload,
                 path=storage_path,
                 file=data,
                 file_options={
@@ -200,6 +220,70 @@ class StorageClient:
             logger.error("bytes_upload_failed", storage_path=storage_path, error=str(e))
             raise
     
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        storage_path: str,
+        content_length: Optional[int] = None,
+        content_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload from an async byte iterator without buffering the whole file
+        
+        Posts straight to the Storage REST endpoint, since the supabase-py
+        client only accepts a complete payload.
+        
+        Args:
+            chunks: Async iterator yielding the file contents
+            storage_path: Destination path in storage
+            content_length: Total size in bytes, if known (else chunked encoding)
+            content_type: MIME type
+            
+        Returns:
+            Dict with upload result including path and size
+        """
+        file_size = 0
+        
+        async def counted():
+            nonlocal file_size
+            async for chunk in chunks:
+                file_size += len(chunk)
+                yield chunk
+        
+        headers = {
+            "Authorization": f"Bearer {self.supabase_key}",
+            "apikey": self.supabase_key,
+            "Content-Type": content_type or "application/octet-stream",
+            "x-upsert": "true"
+        }
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
+        
+        try:
+            async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
+                response = await client.post(
+                    f"{self.supabase_url}/storage/v1/object/{self.bucket_name}/{storage_path}",
+                    content=counted(),
+                    headers=headers
+                )
+                response.raise_for_status()
+            
+            logger.info(
+                "stream_uploaded",
+                storage_path=storage_path,
+                size_bytes=file_size
+            )
+            
+            return {
+                "storage_path": storage_path,
+                "file_size_bytes": file_size,
+                "content_type": content_type
+            }
+            
+        except Exception as e:
+            logger.error("stream_upload_failed", storage_path=storage_path, error=str(e))
+            raise
+    
     async def upload_chunked(
         self,
         file_path: str,
@@ -208,7 +292,11 @@ class StorageClient:
         content_type: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Upload large file in chunks with resumable support
+        Upload a large file by streaming it from disk in chunks
+        
+        Supabase has no multipart API, so the file goes out as a single
+        upload_stream request, hashed as it is read; only one chunk is held
+        in memory at a time.
         
         Args:
             file_path: Local file path to upload
@@ -226,120 +314,39 @@ class StorageClient:
         
         try:
             file_size = os.path.getsize(file_path)
-            total_chunks = (file_size + chunk_size - 1) // chunk_size
             
             logger.info(
                 "chunked_upload_starting",
                 storage_path=storage_path,
                 file_size=file_size,
-                chunk_size=chunk_size,
-                total_chunks=total_chunks
+                chunk_size=chunk_size
             )
             
-            # For Supabase, we'll use multipart upload if available
-            # Otherwise, read file in chunks and upload sequentially
-            chunks = []
             checksum = hashlib.sha256()
             
-            async with aiofiles.open(file_path, 'rb') as f:
-                chunk_index = 0
-                while True:
-                    chunk_data = await f.read(chunk_size)
-                    if not chunk_data:
-                        break
-                    
-                    # Calculate checksum
-                    checksum.update(chunk_data)
-                    
-                    # Upload chunk (Supabase doesn't have native multipart, so we append)
-                    # For now, we'll upload the full file but in a way that can be resumed
-                    chunk_path = f"{storage_path}.part{chunk_index}"
-                    try:
-                        self.client.storage.from_(self.bucket_name).upload(
-                            path=chunk_path,
-                            file=chunk_data,
-                            file_options={
-                                "content-type": content_type or "application/octet-stream",
-                                "upsert": "true"
-                            }
-                        )
-                        chunks.append(chunk_path)
-                        chunk_index += 1
-                        
-                        logger.debug(
-                            "chunk_uploaded",
-                            chunk_index=chunk_index,
-                            total_chunks=total_chunks,
-                            chunk_size=len(chunk_data)
-                        )
-                    except Exception as e:
-                        logger.error("chunk_upload_failed", chunk_index=chunk_index, error=str(e))
-                        # Clean up uploaded chunks on failure
-                        for cp in chunks:
-                            try:
-                                self.client.storage.from_(self.bucket_name).remove([cp])
-                            except:
-                                pass
-                        raise
-            
-            # Combine chunks into final file
-            # For Supabase, we need to download and re-upload, or use a different approach
-            # For now, we'll upload the complete file directly for files < 100MB
-            # For larger files, we'll need to implement proper multipart upload
-            if file_size < 100 * 1024 * 1024:
-                # Small enough to upload directly
+            async def read_file():
                 async with aiofiles.open(file_path, 'rb') as f:
-                    file_data = await f.read()
-                    self.client.storage.from_(self.bucket_name).upload(
-                        path=storage_path,
-                        file=file_data,
-                        file_options={
-                            "content-type": content_type or "application/octet-stream",
-                            "upsert": "true"
-                        }
-                    )
-            else:
-                # For large files, we'll need to implement proper chunking
-                # This is a simplified version - in production, use Supabase's multipart API if available
-                logger.warning(
-                    "large_file_upload",
-                    message="File > 100MB, using direct upload. Consider implementing proper multipart upload."
-                )
-                async with aiofiles.open(file_path, 'rb') as f:
-                    file_data = await f.read()
-                    self.client.storage.from_(self.bucket_name).upload(
-                        path=storage_path,
-                        file=file_data,
-                        file_options={
-                            "content-type": content_type or "application/octet-stream",
-                            "upsert": "true"
-                        }
-                    )
-            
-            # Clean up chunk files
-            for chunk_path in chunks:
-                try:
-                    self.client.storage.from_(self.bucket_name).remove([chunk_path])
-                except:
-                    pass
+                    while chunk_data := await f.read(chunk_size):
+                        checksum.update(chunk_data)
+                        yield chunk_data
+            
+            result = await self.upload_stream(
+                read_file(),
+                storage_path=storage_path,
+                content_length=file_size,
+                content_type=content_type
+            )
             
             final_checksum = checksum.hexdigest()
             
             logger.info(
                 "chunked_upload_completed",
                 storage_path=storage_path,
-                file_size=file_size,
-                total_chunks=total_chunks,
+                file_size=result["file_size_bytes"],
                 checksum=final_checksum
             )
             
-            return {
-                "storage_path": storage_path,
-                "file_size_bytes": file_size,
-                "checksum": final_checksum,
-                "content_type": content_type,
-                "chunks_uploaded": total_chunks
-            }
+            return {**result, "checksum": final_checksum}
             
         except Exception as e:
             logger.error("chunked_upload_failed", storage_path=storage_path, error=str(e))
@@ -362,12 +369,12 @@ class StorageClient:
         """
         try:
             # Download file content
-            response = self.client.storage.from_(self.bucket_name).download(storage_path)
+            response = await self._run(
+                self.client.storage.from_(self.bucket_name).download, storage_path
+            )
             
             # Write to destination
-            Path(destination_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(destination_path, "wb") as f:
-                f.write(response)
+            await self._run(self._write_file, destination_path, response)
             
             logger.info(
                 "file_downloaded",
@@ -392,7 +399,9 @@ class StorageClient:
             File contents as bytes
         """
         try:
-            response = self.client.storage.from_(self.bucket_name).download(storage_path)
+            response = await self._run(
+                self.client.storage.from_(self.bucket_name).download, storage_path
+            )
             
             logger.debug("bytes_downloaded", storage_path=storage_path, size=len(response))
             
@@ -478,7 +487,7 @@ class StorageClient:
             True if deleted successfully
         """
         try:
-            self.client.storage.from_(self.bucket_name).remove([storage_path])
+            await self._run(self.client.storage.from_(self.bucket_name).remove, [storage_path])
             
             logger.info("file_deleted", storage_path=storage_path)
             return True
@@ -505,11 +514,11 @@ class StorageClient:
                 prefix = f"{file_type}/{job_id}/"
                 
                 try:
-                    files = self.client.storage.from_(self.bucket_name).list(prefix)
+                    files = await self._run(self.client.storage.from_(self.bucket_name).list, prefix)
                     
                     if files:
                         paths = [f"{prefix}{f['name']}" for f in files]
-                        self.client.storage.from_(self.bucket_name).remove(paths)
+                        await self._run(self.client.storage.from_(self.bucket_name).remove, paths)
                         deleted_count += len(paths)
                         
                 except Exception:
@@ -610,7 +619,8 @@ def get_storage_client() -> StorageClient:
         _storage_client = StorageClient(
             supabase_url=supabase_url,
             supabase_key=supabase_key,
-            bucket_name=config.supabase_storage_bucket
+            bucket_name=config.supabase_storage_bucket,
+            multipart_threshold=config.storage_multipart_threshold_mb * 1024 * 1024
         )
     
     return _storage_client
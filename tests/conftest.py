@@ -49,11 +49,19 @@ class MockDatabaseClient:
         self.nodes[node.node_id] = node_data
         return node
 
-    async def update_node_heartbeat(self, node_id: str) -> None:
-        """Update node's last heartbeat timestamp"""
+    async def update_node_heartbeat(
+        self, node_id: str, p2p_url: Optional[str] = None, available: bool = True
+    ) -> None:
+        """Update node's last heartbeat timestamp and availability"""
         if node_id in self.nodes:
             self.nodes[node_id]["last_heartbeat"] = datetime.utcnow().isoformat()
-            self.nodes[node_id]["is_available"] = True
+            self.nodes[node_id]["is_available"] = available
+            if p2p_url:
+                self.nodes[node_id]["p2p_url"] = p2p_url
+
+    async def flush_heartbeats(self) -> int:
+        """Heartbeats are applied immediately, nothing is buffered"""
+        return 0
 
     async def set_node_availability(self, node_id: str, available: bool) -> None:
         """Set node availability status"""
@@ -69,7 +77,8 @@ class MockDatabaseClient:
         self,
         gpu_type: Optional[GPUType] = None,
         max_price: Optional[Decimal] = None,
-        min_vram: Optional[Decimal] = None
+        min_vram: Optional[Decimal] = None,
+        min_num_gpus: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Get all active nodes with optional filters"""
         result = []
@@ -82,6 +91,8 @@ class MockDatabaseClient:
                 continue
             if min_vram and (node.get("vram_gb") or 0) < float(min_vram):
                 continue
+            if min_num_gpus and node.get("num_gpus", 1) < min_num_gpus:
+                continue
             result.append(node)
         return sorted(result, key=lambda x: x.get("price_per_hour", 0))
 
@@ -243,7 +254,10 @@ class MockDatabaseClient:
     async def get_pending_jobs(
         self,
         gpu_type: Optional[GPUType] = None,
-        limit: int = 100
+        limit: int = 100,
+        price_per_hour: Optional[Decimal] = None,
+        vram_gb: Optional[Decimal] = None,
+        num_gpus: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Get pending jobs in queue"""
         result = []
@@ -254,6 +268,12 @@ class MockDatabaseClient:
                 req_gpu = job.get("required_gpu_type")
                 if req_gpu and req_gpu != gpu_type.value:
                     continue
+            if price_per_hour is not None and float(job["max_price_per_hour"]) < float(price_per_hour):
+                continue
+            if vram_gb is not None and job.get("min_vram_gb") and float(job["min_vram_gb"]) > float(vram_gb):
+                continue
+            if num_gpus is not None and job.get("num_gpus", 1) > num_gpus:
+                continue
             result.append(job)
         return sorted(result, key=lambda x: x.get("created_at", ""))[:limit]
 
@@ -288,6 +308,12 @@ class MockDatabaseClient:
                     count += 1
         return count
 
+    async def run_maintenance(self, stale_minutes: int = 5, timeout_multiplier: float = 2.0) -> tuple:
+        """Release stale claims and fail overdue executions"""
+        released = await self.release_stale_claims(stale_minutes)
+        failed = await self.mark_stale_executions_failed(timeout_multiplier)
+        return released, failed
+
     # ===== STATISTICS =====
 
     async def get_queue_stats(self) -> List[Dict[str, Any]]:
@@ -0,0 +1,176 @@
+"""
+Unit tests for checkpoint detection and upload
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from src.execution import checkpoint_manager
+from src.execution.checkpoint_manager import CheckpointManager
+
+
+class FakeStorage:
+    """Records streamed uploads; fails the first `failures` attempts"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.uploads = []
+
+    def generate_storage_path(self, job_id, file_name, file_type):
+        return f"{job_id}/{file_type}/{file_name}"
+
+    async def upload_stream(self, chunks, storage_path, **kwargs):
+        body = b"".join([chunk async for chunk in chunks])
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("storage unavailable")
+        self.uploads.append((storage_path, body, kwargs))
+        return {"path": storage_path}
+
+
+class FakeDB:
+    """Records bulk checkpoint saves; optionally fails them"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.batches = []
+
+    async def save_checkpoints_bulk(self, rows):
+        if self.fail:
+            raise RuntimeError("db unavailable")
+        self.batches.append(rows)
+        return [f"ckpt-{i}" for i in range(len(rows))]
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    """Workspace directory with an empty checkpoints/ subdirectory"""
+    (tmp_path / "checkpoints").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def manager(workspace, monkeypatch):
+    monkeypatch.setattr(checkpoint_manager, "UPLOAD_RETRY_BASE_DELAY", 0)
+    mgr = CheckpointManager("job-1", workspace)
+    mgr._storage = FakeStorage()
+    mgr._db = FakeDB()
+    return mgr
+
+
+def write(path, content: bytes = b"weights"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+class TestDetectCheckpointFiles:
+    """Test the workspace scan"""
+
+    def test_matches_checkpoint_names(self, manager, workspace):
+        write(workspace / "checkpoints" / "checkpoint_epoch1.pt")
+        write(workspace / "out" / "model.safetensors")
+        write(workspace / "out" / "train.py", b"print()")
+
+        found = {p.name for p in manager.detect_checkpoint_files()}
+        assert found == {"checkpoint_epoch1.pt", "model.safetensors"}
+
+    @pytest.mark.parametrize("pruned", [".git", "venv", "__pycache__", "wandb", "datasets"])
+    def test_prunes_directories(self, manager, workspace, pruned):
+        write(workspace / pruned / "nested" / "checkpoint.pt")
+        assert manager.detect_checkpoint_files() == []
+
+    def test_checkpoint_dir_scanned_once(self, manager, workspace):
+        write(workspace / "checkpoints" / "checkpoint.pt")
+        assert len(manager.detect_checkpoint_files()) == 1
+
+    def test_does_not_follow_symlinks(self, manager, workspace, tmp_path_factory):
+        outside = tmp_path_factory.mktemp("outside")
+        write(outside / "checkpoint.pt")
+        os.symlink(outside, workspace / "linked")
+        os.symlink(outside / "checkpoint.pt", workspace / "checkpoint_link.pt")
+        assert manager.detect_checkpoint_files() == []
+
+    def test_skips_claimed_until_rewritten(self, manager, workspace):
+        path = write(workspace / "checkpoints" / "checkpoint.pt")
+        st = path.stat()
+        manager.uploaded_checkpoints[str(path)] = (st.st_mtime_ns, st.st_size)
+        assert manager.detect_checkpoint_files() == []
+
+        path.write_bytes(b"rewritten weights")
+        assert manager.detect_checkpoint_files() == [path]
+
+
+class TestScanAndUpload:
+    """Test concurrent upload, claiming and the bulk metadata save"""
+
+    async def test_uploads_and_saves_in_one_batch(self, manager, workspace):
+        write(workspace / "checkpoints" / "checkpoint_epoch1_step10.pt", b"a")
+        write(workspace / "checkpoints" / "checkpoint_epoch2_step20.pt", b"bb")
+
+        ids = await manager.scan_and_upload_checkpoints()
+
+        assert sorted(ids) == ["ckpt-0", "ckpt-1"]
+        assert len(manager._db.batches) == 1
+        rows = {row["checkpoint_name"]: row for row in manager._db.batches[0]}
+        row = rows["checkpoint_epoch2_step20.pt"]
+        assert (row["epoch"], row["step"], row["file_size_bytes"]) == (2, 20, 2)
+        assert row["checksum"] == hashlib.sha256(b"bb").hexdigest()
+        assert row["storage_path"] == "job-1/checkpoint/checkpoint_epoch2_step20.pt"
+
+    async def test_uploaded_file_not_reuploaded(self, manager, workspace):
+        write(workspace / "checkpoints" / "checkpoint.pt")
+        await manager.scan_and_upload_checkpoints()
+
+        assert await manager.scan_and_upload_checkpoints() == []
+        assert len(manager._storage.uploads) == 1
+
+    async def test_reuploads_after_rewrite(self, manager, workspace):
+        path = write(workspace / "checkpoints" / "checkpoint.pt", b"v1")
+        await manager.scan_and_upload_checkpoints()
+
+        path.write_bytes(b"version 2")
+        ids = await manager.scan_and_upload_checkpoints()
+
+        assert ids == ["ckpt-0"]
+        assert [body for _, body, _ in manager._storage.uploads] == [b"v1", b"version 2"]
+        st = path.stat()
+        assert manager.uploaded_checkpoints[str(path)] == (st.st_mtime_ns, st.st_size)
+
+    async def test_retry_restreams_without_content_length(self, manager, workspace):
+        write(workspace / "checkpoints" / "checkpoint.pt", b"weights")
+        manager._storage.failures = 1
+
+        assert await manager.scan_and_upload_checkpoints() == ["ckpt-0"]
+        [(_, body, kwargs)] = manager._storage.uploads
+        assert body == b"weights"
+        assert "content_length" not in kwargs
+
+    async def test_releases_claim_when_nothing_landed(self, manager, workspace):
+        path = write(workspace / "checkpoints" / "checkpoint.pt")
+        manager._storage.failures = checkpoint_manager.UPLOAD_ATTEMPTS
+        manager._db.fail = True
+
+        assert await manager.scan_and_upload_checkpoints() == []
+        assert str(path) not in manager.uploaded_checkpoints
+        assert manager.detect_checkpoint_files() == [path]
+
+    async def test_keeps_claim_when_stored_without_db_row(self, manager, workspace):
+        path = write(workspace / "checkpoints" / "checkpoint.pt")
+        manager._db.fail = True
+
+        assert await manager.scan_and_upload_checkpoints() == []
+        assert str(path) in manager.uploaded_checkpoints
+
+    async def test_releases_claim_on_transfer_error(self, manager, workspace, monkeypatch):
+        path = write(workspace / "checkpoints" / "checkpoint.pt")
+
+        def fail(file_path):
+            raise ValueError("bad name")
+
+        monkeypatch.setattr(manager, "parse_checkpoint_metadata", fail)
+        assert await manager.scan_and_upload_checkpoints() == []
+        assert str(path) not in manager.uploaded_checkpoints
+        assert manager._db.batches == []
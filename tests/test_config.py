@@ -44,6 +44,13 @@ class TestConfigurationLoading:
         config = SellerConfig(seller_private_key="0x1234abcd")
         assert config.seller_private_key == "0x1234abcd"
 
+        # Empty key is left untouched
+        config = BuyerConfig(buyer_private_key="")
+        assert config.buyer_private_key == ""
+
+        config = BuyerConfig(buyer_private_key="1234abcd")
+        assert config.buyer_private_key == "0x1234abcd"
+
     def test_config_environment_variables(self, monkeypatch):
         """Test that config loads from environment variables"""
         monkeypatch.setenv("MARKETPLACE_PORT", "9000")
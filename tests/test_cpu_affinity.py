@@ -0,0 +1,71 @@
+"""
+Unit tests for CPU set allocation
+"""
+
+import pytest
+
+from src.execution import cpu_affinity
+from src.execution.cpu_affinity import CpuSetAllocator, _parse_cpulist, read_numa_topology
+
+
+@pytest.fixture
+def fake_sysfs(tmp_path, monkeypatch):
+    """Point NUMA discovery at a temporary sysfs tree with all CPUs usable"""
+    monkeypatch.setattr(cpu_affinity, "NUMA_SYSFS_DIR", tmp_path)
+    monkeypatch.setattr(cpu_affinity, "_usable_cpus", lambda: set(range(16)))
+
+    def add_node(node: int, cpulist: str) -> None:
+        node_dir = tmp_path / f"node{node}"
+        node_dir.mkdir()
+        (node_dir / "cpulist").write_text(cpulist + "\n")
+
+    return add_node
+
+
+class TestCpulistParsing:
+    """Test kernel cpulist parsing"""
+
+    def test_ranges_and_singles(self):
+        assert _parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+
+    def test_empty(self):
+        assert _parse_cpulist("\n") == []
+
+
+class TestNumaTopology:
+    """Test NUMA topology discovery"""
+
+    def test_reads_nodes(self, fake_sysfs):
+        fake_sysfs(0, "0-3")
+        fake_sysfs(1, "4-7")
+        assert read_numa_topology() == {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]}
+
+    def test_drops_unusable_cpus(self, fake_sysfs, monkeypatch):
+        fake_sysfs(0, "0-3")
+        fake_sysfs(1, "4-7")
+        monkeypatch.setattr(cpu_affinity, "_usable_cpus", lambda: {1, 2})
+        assert read_numa_topology() == {0: [1, 2]}
+
+    def test_falls_back_without_numa_info(self, fake_sysfs):
+        assert read_numa_topology() == {None: list(range(16))}
+
+
+class TestCpuSetAllocator:
+    """Test CPU set reservation"""
+
+    def test_acquire_stays_on_one_node(self):
+        allocator = CpuSetAllocator({0: [0, 1, 2], 1: [3, 4, 5, 6]})
+        assert allocator.acquire(2) == ([0, 1], 0)
+        # Node 0 has a single CPU left, so the next set comes from node 1
+        assert allocator.acquire(2) == ([3, 4], 1)
+
+    def test_exhaustion_and_release(self):
+        allocator = CpuSetAllocator({None: [0, 1, 2, 3]})
+        first = allocator.acquire(2)
+        second = allocator.acquire(2)
+        assert first == ([0, 1], None)
+        assert second == ([2, 3], None)
+        assert allocator.acquire(1) is None
+
+        allocator.release(first[0])
+        assert allocator.acquire(2) == ([0, 1], None)
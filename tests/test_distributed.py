@@ -0,0 +1,29 @@
+"""
+Unit tests for distributed training detection
+"""
+
+import pytest
+
+from src.execution.distributed import DistributedBackend, detect_distributed_backend
+
+
+class TestDistributedBackendDetection:
+    """Test DDP detection from job script content"""
+
+    @pytest.mark.parametrize("script", [
+        "from torch.nn.parallel import DistributedDataParallel as DDP\nmodel = DDP(model)\n",
+        "import torch\ntorch.distributed.init_process_group(backend='nccl')\n",
+        "import torch.distributed as dist\n",
+    ])
+    def test_detects_ddp(self, script):
+        """Each DDP marker is detected on its own"""
+        assert detect_distributed_backend(script) == DistributedBackend.DDP
+
+    def test_plain_script_is_not_distributed(self):
+        """Scripts without DDP markers run single-process"""
+        script = "import torch\nmodel = torch.nn.Linear(4, 2)\nprint(model(torch.ones(4)))\n"
+        assert detect_distributed_backend(script) == DistributedBackend.NONE
+
+    def test_matching_is_case_sensitive(self):
+        """Markers are Python identifiers, so other casings don't count"""
+        assert detect_distributed_backend("# distributeddataparallel\n") == DistributedBackend.NONE
@@ -0,0 +1,96 @@
+"""
+Unit tests for cgroup-based container limits
+"""
+
+import pytest
+
+from src.execution import host_limits
+from src.execution.host_limits import (
+    auto_container_limits,
+    read_cgroup_cpu_limit,
+    read_cgroup_memory_limit,
+)
+
+
+@pytest.fixture
+def cgroup(tmp_path, monkeypatch):
+    """Point cgroup reads at a temporary tree; returns a file writer"""
+    monkeypatch.setattr(host_limits, "CGROUP_ROOT", tmp_path)
+    monkeypatch.setattr(host_limits, "_own_cgroup_dir", lambda: tmp_path / "agent")
+
+    def write(relative: str, content: str) -> None:
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content + "\n")
+
+    return write
+
+
+class TestCgroupCpuLimit:
+    """Test CPU quota reads"""
+
+    def test_v2_quota(self, cgroup):
+        cgroup("agent/cpu.max", "250000 100000")
+        assert read_cgroup_cpu_limit() == 2.5
+
+    def test_v2_unlimited(self, cgroup):
+        cgroup("agent/cpu.max", "max 100000")
+        assert read_cgroup_cpu_limit() is None
+
+    def test_v1_quota(self, cgroup):
+        cgroup("cpu/cpu.cfs_quota_us", "150000")
+        cgroup("cpu/cpu.cfs_period_us", "100000")
+        assert read_cgroup_cpu_limit() == 1.5
+
+    def test_v1_unlimited(self, cgroup):
+        cgroup("cpu/cpu.cfs_quota_us", "-1")
+        cgroup("cpu/cpu.cfs_period_us", "100000")
+        assert read_cgroup_cpu_limit() is None
+
+    def test_no_cgroup_info(self, cgroup):
+        assert read_cgroup_cpu_limit() is None
+
+
+class TestCgroupMemoryLimit:
+    """Test memory limit reads"""
+
+    def test_v2_limit(self, cgroup):
+        cgroup("agent/memory.max", str(8 * 1024 ** 3))
+        assert read_cgroup_memory_limit() == 8 * 1024 ** 3
+
+    def test_v2_unlimited(self, cgroup):
+        cgroup("agent/memory.max", "max")
+        assert read_cgroup_memory_limit() is None
+
+    def test_v1_unlimited_sentinel(self, cgroup):
+        cgroup("memory/memory.limit_in_bytes", "9223372036854771712")
+        assert read_cgroup_memory_limit() is None
+
+    def test_v1_limit(self, cgroup):
+        cgroup("memory/memory.limit_in_bytes", str(2 * 1024 ** 3))
+        assert read_cgroup_memory_limit() == 2 * 1024 ** 3
+
+
+class TestAutoContainerLimits:
+    """Test splitting the host budget between jobs"""
+
+    def test_splits_cgroup_budget(self, cgroup, monkeypatch):
+        # A large host, so the cgroup is the binding limit
+        monkeypatch.setattr(host_limits.os, "sched_getaffinity", lambda pid: set(range(64)), raising=False)
+        monkeypatch.setattr(
+            host_limits.os, "sysconf", lambda name: 4096 if name == "SC_PAGE_SIZE" else 64 * 1024 ** 2
+        )
+        cgroup("agent/cpu.max", "800000 100000")
+        cgroup("agent/memory.max", str(16 * 1024 ** 3))
+
+        cpus, memory = auto_container_limits(concurrent_jobs=2, cpu_fraction=0.5, memory_fraction=0.5)
+        assert cpus == 2.0
+        assert memory == f"{4 * 1024}m"
+
+    def test_minimums(self, cgroup):
+        cgroup("agent/cpu.max", "10000 100000")
+        cgroup("agent/memory.max", str(64 * 1024 ** 2))
+
+        cpus, memory = auto_container_limits(concurrent_jobs=4)
+        assert cpus == 1.0
+        assert memory == "256m"